@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Vectorized backtest engine
+Grades stored signals against historical OHLC bars held as NumPy arrays.
+
+For every signal the engine finds the first bar inside [created_at, expires_at]
+whose high reaches the take-profit (BUY) or whose low reaches the stop-loss,
+and vice versa for SELL. Instead of walking bars per signal, each asset gets
+sparse tables of range-max(high) / range-min(low), and all of that asset's
+signals are advanced together by binary lifting: O(log bars) array steps per
+asset regardless of how many signals there are.
+
+Bars live in BACKTEST_BARS_DIR as `<ASSET>.npz` (arrays: time, high, low,
+close; time in epoch seconds, ascending) or `<ASSET>.csv` with a
+`time,open,high,low,close` header.
+
+    python backtest.py --bars-dir ./bars [--user-id ID] [--group-by asset,timeframe,confidence]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+OPEN, HIT_TP, STOPPED_OUT, EXPIRED, NO_DATA = 0, 1, 2, 3, 4
+OUTCOME_NAMES = {OPEN: "open", HIT_TP: "hit_tp", STOPPED_OUT: "stopped_out", EXPIRED: "expired", NO_DATA: "no_data"}
+GROUP_FIELDS = ("asset", "timeframe", "confidence")
+
+class BarSeries:
+    """Minute (or any interval) OHLC bars for one asset"""
+    __slots__ = ("time", "high", "low", "close")
+
+    def __init__(self, time, high, low, close):
+        self.time = np.asarray(time, dtype=np.int64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+
+def load_bars(bars_dir: str, asset: str) -> Optional[BarSeries]:
+    npz_path = os.path.join(bars_dir, f"{asset}.npz")
+    if os.path.exists(npz_path):
+        with np.load(npz_path) as data:
+            return BarSeries(data["time"], data["high"], data["low"], data["close"])
+    csv_path = os.path.join(bars_dir, f"{asset}.csv")
+    if os.path.exists(csv_path):
+        data = np.genfromtxt(csv_path, delimiter=",", names=True)
+        return BarSeries(data["time"], data["high"], data["low"], data["close"])
+    return None
+
+class BarStore:
+    """Lazily loads and keeps bar series in memory, one per asset"""
+
+    def __init__(self, bars_dir: str):
+        self.bars_dir = bars_dir
+        self._series: Dict[str, Optional[BarSeries]] = {}
+
+    def get(self, asset: str) -> Optional[BarSeries]:
+        if asset not in self._series:
+            self._series[asset] = load_bars(self.bars_dir, asset)
+        return self._series[asset]
+
+def to_epoch_seconds(values: Iterable) -> np.ndarray:
+    """Convert stored created_at/expires_at values (ISO strings or datetimes) to epoch seconds"""
+    out = []
+    for value in values:
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            out.append(int(value.timestamp()))
+        else:
+            out.append(int(datetime.fromisoformat(value).timestamp()))
+    return np.asarray(out, dtype=np.int64)
+
+def signals_to_arrays(signal_docs: List[dict]) -> Dict[str, np.ndarray]:
+    """Column arrays for the engine from stored signal documents"""
+    take_profit = [doc.get("take_profit") or [None] for doc in signal_docs]
+    return {
+        "asset": np.asarray([doc["asset"] for doc in signal_docs], dtype=object),
+        "timeframe": np.asarray([doc.get("timeframe", "") for doc in signal_docs], dtype=object),
+        "sell": np.asarray([doc.get("signal") == "SELL" for doc in signal_docs], dtype=bool),
+        "entry": np.asarray([doc.get("entry", np.nan) for doc in signal_docs], dtype=np.float64),
+        "take_profit": np.asarray([tp[0] if tp[0] is not None else np.nan for tp in take_profit], dtype=np.float64),
+        "stop_loss": np.asarray([doc.get("stop_loss") if doc.get("stop_loss") is not None else np.nan
+                                 for doc in signal_docs], dtype=np.float64),
+        "confidence": np.asarray([doc.get("confidence", 0) for doc in signal_docs], dtype=np.int64),
+        "created_at": to_epoch_seconds(doc["created_at"] for doc in signal_docs),
+        "expires_at": to_epoch_seconds(doc["expires_at"] for doc in signal_docs),
+    }
+
+def build_sparse_table(values: np.ndarray, reducer) -> List[np.ndarray]:
+    """table[k][i] = reducer over values[i : i + 2**k]"""
+    table = [values]
+    span = 1
+    while span * 2 <= len(values):
+        previous = table[-1]
+        table.append(reducer(previous[:-span], previous[span:]))
+        span *= 2
+    return table
+
+def first_crossing(table: List[np.ndarray], starts: np.ndarray, ends: np.ndarray,
+                   levels: np.ndarray, above: bool) -> np.ndarray:
+    """Index of the first bar in [start, end) crossing level, or end if none.
+
+    above=True uses a range-max table of highs (cross when high >= level);
+    above=False uses a range-min table of lows (cross when low <= level).
+    """
+    position = starts.copy()
+    for k in range(len(table) - 1, -1, -1):
+        span = 1 << k
+        fits = position + span <= ends
+        window = table[k][np.where(fits, position, 0)]
+        clear = window < levels if above else window > levels
+        position = np.where(fits & clear, position + span, position)
+    return position
+
+def backtest_asset(bars: BarSeries, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Outcome, exit bar, R multiple and minutes-to-outcome for one asset's signals"""
+    count = len(columns["entry"])
+    starts = np.searchsorted(bars.time, columns["created_at"], side="left")
+    ends = np.searchsorted(bars.time, columns["expires_at"], side="right")
+    has_data = starts < ends
+
+    # Only build tables over the bar range these signals actually touch
+    lo = int(starts.min()) if count else 0
+    hi = int(ends.max()) if count else 0
+    if hi <= lo:
+        return {
+            "outcome": np.full(count, NO_DATA, dtype=np.int8),
+            "r_multiple": np.full(count, np.nan),
+            "minutes": np.full(count, np.nan),
+        }
+    highs = build_sparse_table(bars.high[lo:hi], np.maximum)
+    lows = build_sparse_table(bars.low[lo:hi], np.minimum)
+    rel_starts, rel_ends = starts - lo, ends - lo
+
+    sell = columns["sell"]
+    take_profit, stop_loss, entry = columns["take_profit"], columns["stop_loss"], columns["entry"]
+    # Missing levels never trigger
+    up_level = np.where(sell, stop_loss, take_profit)
+    down_level = np.where(sell, take_profit, stop_loss)
+    up_level = np.where(np.isnan(up_level), np.inf, up_level)
+    down_level = np.where(np.isnan(down_level), -np.inf, down_level)
+
+    up_hit = first_crossing(highs, rel_starts, rel_ends, up_level, above=True) + lo
+    down_hit = first_crossing(lows, rel_starts, rel_ends, down_level, above=False) + lo
+
+    tp_hit = np.where(sell, down_hit, up_hit)
+    sl_hit = np.where(sell, up_hit, down_hit)
+    # A bar that touches both levels is scored conservatively as a stop-out
+    stopped = sl_hit < ends
+    stopped &= sl_hit <= tp_hit
+    won = (tp_hit < ends) & ~stopped
+
+    outcome = np.full(count, OPEN, dtype=np.int8)
+    outcome[columns["expires_at"] <= bars.time[-1]] = EXPIRED  # window fully covered by data
+    outcome[won] = HIT_TP
+    outcome[stopped] = STOPPED_OUT
+    outcome[~has_data] = NO_DATA
+
+    exit_index = np.where(won, tp_hit, np.where(stopped, sl_hit, np.maximum(ends - 1, 0)))
+    exit_index = np.minimum(exit_index, len(bars.time) - 1)
+
+    risk = np.abs(entry - stop_loss)
+    risk = np.where(risk > 0, risk, np.nan)
+    direction = np.where(sell, -1.0, 1.0)
+    r_multiple = np.where(
+        won, np.abs(take_profit - entry) / risk,
+        np.where(stopped, -1.0, direction * (bars.close[exit_index] - entry) / risk)
+    )
+    r_multiple[~has_data] = np.nan
+
+    minutes = np.where(won | stopped, (bars.time[exit_index] - columns["created_at"]) / 60.0, np.nan)
+    return {"outcome": outcome, "r_multiple": r_multiple, "minutes": minutes}
+
+def run_backtest(columns: Dict[str, np.ndarray], bar_store: BarStore) -> Dict[str, np.ndarray]:
+    """Backtest every signal, processing one asset at a time"""
+    count = len(columns["entry"])
+    results = {
+        "outcome": np.full(count, NO_DATA, dtype=np.int8),
+        "r_multiple": np.full(count, np.nan),
+        "minutes": np.full(count, np.nan),
+    }
+    assets, asset_index = np.unique(columns["asset"].astype(str), return_inverse=True)
+    for code, asset in enumerate(assets):
+        bars = bar_store.get(asset)
+        if bars is None or len(bars.time) == 0:
+            continue
+        rows = np.nonzero(asset_index == code)[0]
+        subset = {name: values[rows] for name, values in columns.items()}
+        for name, values in backtest_asset(bars, subset).items():
+            results[name][rows] = values
+    return results
+
+def group_stats(group_index: np.ndarray, groups: int, results: Dict[str, np.ndarray]) -> List[dict]:
+    """Per-group outcome counts and averages using bincount instead of per-group masks"""
+    outcome = results["outcome"]
+    signals = np.bincount(group_index, minlength=groups)
+    counts = {
+        code: np.bincount(group_index[outcome == code], minlength=groups)
+        for code in OUTCOME_NAMES
+    }
+
+    def mean(values):
+        finite = np.isfinite(values)
+        total = np.bincount(group_index, weights=np.where(finite, values, 0.0), minlength=groups)
+        seen = np.bincount(group_index, weights=finite, minlength=groups)
+        return [round(float(t / n), 3) if n else None for t, n in zip(total, seen)]
+
+    r_multiple = mean(results["r_multiple"])
+    minutes = mean(results["minutes"])
+    rows = []
+    for g in range(groups):
+        wins, losses = int(counts[HIT_TP][g]), int(counts[STOPPED_OUT][g])
+        rows.append({
+            "signals": int(signals[g]),
+            **{OUTCOME_NAMES[code]: int(counts[code][g]) for code in OUTCOME_NAMES},
+            "hit_rate": round(wins / (wins + losses) * 100, 1) if wins + losses else 0,
+            "avg_r_multiple": r_multiple[g],
+            "avg_minutes_to_outcome": round(minutes[g], 1) if minutes[g] is not None else None,
+        })
+    return rows
+
+def summarize(columns: Dict[str, np.ndarray], results: Dict[str, np.ndarray],
+              group_by: Iterable[str] = GROUP_FIELDS) -> dict:
+    """Hit rate, average R and time-to-outcome per group and overall"""
+    count = len(results["outcome"])
+    overall = group_stats(np.zeros(count, dtype=np.int64), 1, results)[0]
+
+    group_by = [field for field in group_by if field in GROUP_FIELDS]
+    if not group_by or not count:
+        return {"overall": overall, "groups": []}
+
+    # Encode each grouping column as small integer codes, then combine them
+    labels, combined = [], np.zeros(count, dtype=np.int64)
+    for field in group_by:
+        if field == "confidence":
+            values = columns["confidence"] // 10 * 10
+        else:
+            values = columns[field].astype(str)
+        uniques, codes = np.unique(values, return_inverse=True)
+        labels.append(uniques)
+        combined = combined * len(uniques) + codes.reshape(-1)
+    keys, group_index = np.unique(combined, return_inverse=True)
+    group_index = group_index.reshape(-1)
+
+    groups = []
+    for key, stats in zip(keys, group_stats(group_index, len(keys), results)):
+        label = {}
+        for field, uniques in reversed(list(zip(group_by, labels))):
+            key, code = divmod(int(key), len(uniques))
+            value = uniques[code]
+            label[field] = f"{int(value)}-{int(value) + 9}" if field == "confidence" else str(value)
+        groups.append({**{field: label[field] for field in group_by}, **stats})
+    return {"overall": overall, "groups": groups}
+
+async def load_signal_docs(user_id: Optional[str]) -> List[dict]:
+    import server
+
+    query = {"user_id": user_id} if user_id else {}
+    projection = {"_id": 0, "asset": 1, "timeframe": 1, "signal": 1, "entry": 1, "take_profit": 1,
+                  "stop_loss": 1, "confidence": 1, "created_at": 1, "expires_at": 1}
+    return await server.signals_collection.find(query, projection).to_list(length=None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest stored signals against OHLC bars")
+    parser.add_argument("--bars-dir", default=os.environ.get("BACKTEST_BARS_DIR"), required=not os.environ.get("BACKTEST_BARS_DIR"))
+    parser.add_argument("--user-id", help="only backtest this user's signals")
+    parser.add_argument("--group-by", default="asset,timeframe,confidence")
+    args = parser.parse_args()
+
+    signal_docs = asyncio.run(load_signal_docs(args.user_id))
+    if not signal_docs:
+        print(json.dumps({"overall": {"signals": 0}, "groups": []}, indent=2))
+        return 0
+    columns = signals_to_arrays(signal_docs)
+    results = run_backtest(columns, BarStore(args.bars_dir))
+    print(json.dumps(summarize(columns, results, args.group_by.split(",")), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
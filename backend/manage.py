@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Maintenance commands
+Run from the backend directory with the same .env as the API server:
+
+    python manage.py rebuild-rollups [--user-id ID] [--check]
+    python manage.py rebuild-daily [--user-id ID] [--since DATE] [--until DATE] [--chunk-days N] [--workers N] [--check]
+    python manage.py migrate-dates [--batch-size N] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+import server
+
+# Timestamp fields written as ISO strings before they were stored as BSON dates
+DATE_FIELDS = {
+    "users": ("created_at",),
+    "signals": ("created_at", "expires_at", "updated_at"),
+    "subscriptions": ("created_at", "expires_at", "updated_at", "cancelled_at"),
+}
+
+def rollup_key(rollup: dict) -> tuple:
+    counts = {status: n for status, n in (rollup or {}).get("status", {}).items() if n}
+    return (
+        (rollup or {}).get("total_signals", 0),
+        (rollup or {}).get("confidence_sum", 0),
+        tuple(sorted(counts.items())),
+    )
+
+async def rebuild_rollups(user_id, check_only: bool) -> int:
+    """Recompute per-user performance rollups from signals_collection"""
+    rebuilt = {r["user_id"]: r for r in await server.rebuild_performance_rollups(user_id)}
+    query = {"user_id": user_id} if user_id else {}
+    stored = {
+        r["user_id"]: r
+        async for r in server.performance_collection.find(query, {"_id": 0})
+    }
+
+    drifted = [uid for uid in rebuilt.keys() | stored.keys()
+               if rollup_key(rebuilt.get(uid)) != rollup_key(stored.get(uid))]
+    for uid in drifted:
+        print(f"{'drift' if check_only else 'repair'}: {uid} stored={rollup_key(stored.get(uid))} "
+              f"actual={rollup_key(rebuilt.get(uid))}")
+
+    if not check_only:
+        for uid in drifted:
+            if uid in rebuilt:
+                # Move the data version forward so clients holding an old ETag refetch
+                version = (stored.get(uid) or {}).get("version", 0) + 1
+                await server.performance_collection.replace_one(
+                    {"user_id": uid}, {**rebuilt[uid], "version": version}, upsert=True
+                )
+            else:
+                await server.performance_collection.delete_one({"user_id": uid})
+
+    print(f"{len(rebuilt.keys() | stored.keys())} users checked, {len(drifted)} {'drifted' if check_only else 'repaired'}")
+    return 1 if check_only and drifted else 0
+
+def daily_key(bucket: dict) -> tuple:
+    return bucket["user_id"], server.as_utc_datetime(bucket["day"]), bucket.get("asset"), bucket.get("timeframe")
+
+async def rebuild_daily_chunk(start: datetime, end: datetime, user_id, check_only: bool) -> tuple:
+    """Recompute the daily buckets of signals created in [start, end); returns (buckets, drifted)"""
+    match = {"created_at": {"$gte": start, "$lt": end}}
+    query = {"day": {"$gte": start, "$lt": end}}
+    if user_id:
+        match["user_id"] = query["user_id"] = user_id
+    pipeline = [
+        {"$match": match},
+        {"$group": {
+            "_id": {
+                "user_id": "$user_id",
+                "year": {"$year": "$created_at"},
+                "month": {"$month": "$created_at"},
+                "day": {"$dayOfMonth": "$created_at"},
+                "asset": "$asset",
+                "timeframe": "$timeframe",
+                "status": "$status"
+            },
+            "count": {"$sum": 1},
+            "confidence_sum": {"$sum": {"$ifNull": ["$confidence", 0]}}
+        }}
+    ]
+    rebuilt = {}
+    async for row in server.signals_collection.aggregate(pipeline, allowDiskUse=True):
+        group = row["_id"]
+        day = datetime(group["year"], group["month"], group["day"], tzinfo=timezone.utc)
+        key = (group["user_id"], day, group.get("asset"), group.get("timeframe"))
+        bucket = rebuilt.setdefault(key, {
+            "user_id": key[0], "day": day, "asset": key[2], "timeframe": key[3],
+            "total_signals": 0, "confidence_sum": 0, "status": {}
+        })
+        bucket["total_signals"] += row["count"]
+        bucket["confidence_sum"] += row["confidence_sum"]
+        bucket["status"][group["status"]] = row["count"]
+    stored = {daily_key(b): b async for b in server.daily_collection.find(query, {"_id": 0})}
+
+    drifted = [key for key in rebuilt.keys() | stored.keys()
+               if rollup_key(rebuilt.get(key)) != rollup_key(stored.get(key))]
+    if drifted and not check_only:
+        writes = []
+        for key in drifted:
+            bucket_filter = {"user_id": key[0], "day": key[1], "asset": key[2], "timeframe": key[3]}
+            writes.append(ReplaceOne(bucket_filter, rebuilt[key], upsert=True) if key in rebuilt
+                          else DeleteOne(bucket_filter))
+        await server.daily_collection.bulk_write(writes, ordered=False)
+    print(f"{start:%Y-%m-%d}..{end:%Y-%m-%d}: {len(rebuilt.keys() | stored.keys())} buckets, "
+          f"{len(drifted)} {'drifted' if check_only else 'repaired'}")
+    return len(rebuilt.keys() | stored.keys()), len(drifted)
+
+async def rebuild_daily(user_id, since, until, chunk_days: int, workers: int, check_only: bool) -> int:
+    """Backfill performance_daily from signals_collection, chunks of days aggregated in parallel.
+
+    Chunks cover whole UTC days, so each owns its buckets outright. Signals
+    still stored with ISO-string timestamps are skipped; run migrate-dates first.
+    """
+    if since is None:
+        first = await server.signals_collection.find(
+            {"user_id": user_id} if user_id else {}, {"_id": 0, "created_at": 1}
+        ).sort("created_at", 1).limit(1).to_list(length=1)
+        if not first:
+            print("no signals to rebuild from")
+            return 0
+        since = first[0]["created_at"]
+    start = server.utc_day(since)
+    end = server.utc_day(until or datetime.now(timezone.utc)) + timedelta(days=1)
+
+    chunks = []
+    while start < end:
+        chunks.append((start, min(start + timedelta(days=chunk_days), end)))
+        start = chunks[-1][1]
+    slots = asyncio.Semaphore(workers)
+
+    async def run(chunk):
+        async with slots:
+            return await rebuild_daily_chunk(*chunk, user_id, check_only)
+
+    results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+    buckets = sum(checked for checked, _ in results)
+    drifted = sum(count for _, count in results)
+    print(f"{len(chunks)} chunks, {buckets} buckets checked, {drifted} {'drifted' if check_only else 'repaired'}")
+    return 1 if check_only and drifted else 0
+
+async def migrate_dates(batch_size: int, dry_run: bool) -> int:
+    """Convert legacy ISO-string timestamps to BSON dates, one _id-ordered batch at a time"""
+    failed = 0
+    for name, fields in DATE_FIELDS.items():
+        collection = server.db[name]
+        legacy = {"$or": [{field: {"$type": "string"}} for field in fields]}
+        converted = skipped = 0
+        last_id = None
+        while True:
+            query = legacy if last_id is None else {"$and": [legacy, {"_id": {"$gt": last_id}}]}
+            batch = await collection.find(query, {field: 1 for field in fields}) \
+                .sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                break
+            last_id = batch[-1]["_id"]
+            updates = []
+            for doc in batch:
+                try:
+                    changes = {f: server.as_utc_datetime(doc[f]) for f in fields if isinstance(doc.get(f), str)}
+                except ValueError as e:
+                    print(f"skip: {name} {doc['_id']}: {e}")
+                    skipped += 1
+                    continue
+                updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": changes}))
+            if updates and not dry_run:
+                await collection.bulk_write(updates, ordered=False)
+            converted += len(updates)
+        print(f"{name}: {converted} documents {'to convert' if dry_run else 'converted'}, {skipped} skipped")
+        failed += skipped
+
+    # The unique subscriptions.user_id index created at startup needs these resolved first
+    duplicates = await server.subscriptions_collection.aggregate([
+        {"$group": {"_id": "$user_id", "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ]).to_list(length=None)
+    for dup in duplicates:
+        print(f"duplicate subscription: user_id={dup['_id']} count={dup['count']}")
+    return 1 if failed or duplicates else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rollups = commands.add_parser("rebuild-rollups", help="recompute performance rollups from raw signals")
+    rollups.add_argument("--user-id", help="only rebuild this user")
+    rollups.add_argument("--check", action="store_true", help="report drift without writing; exit 1 if any")
+
+    daily = commands.add_parser("rebuild-daily", help="backfill the performance_daily buckets from raw signals")
+    daily.add_argument("--user-id", help="only rebuild this user")
+    daily.add_argument("--since", type=datetime.fromisoformat, help="first day (default: oldest signal)")
+    daily.add_argument("--until", type=datetime.fromisoformat, help="last day, inclusive (default: today)")
+    daily.add_argument("--chunk-days", type=int, default=30, help="days aggregated per chunk")
+    daily.add_argument("--workers", type=int, default=4, help="chunks aggregated concurrently")
+    daily.add_argument("--check", action="store_true", help="report drift without writing; exit 1 if any")
+
+    dates = commands.add_parser("migrate-dates", help="convert ISO-string timestamps to BSON dates")
+    dates.add_argument("--batch-size", type=int, default=1000)
+    dates.add_argument("--dry-run", action="store_true", help="count documents to convert without writing")
+
+    args = parser.parse_args()
+    if args.command == "rebuild-rollups":
+        return asyncio.run(rebuild_rollups(args.user_id, args.check))
+    if args.command == "rebuild-daily":
+        return asyncio.run(rebuild_daily(
+            args.user_id, args.since, args.until, args.chunk_days, args.workers, args.check
+        ))
+    if args.command == "migrate-dates":
+        return asyncio.run(migrate_dates(args.batch_size, args.dry_run))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
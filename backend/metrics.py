@@ -0,0 +1,132 @@
+"""
+SignalDesk AI - Prometheus metrics
+Request latency per route, MongoDB command timings per collection, LLM and
+bcrypt timings, and in-flight gauges, exposed on GET /metrics.
+
+Hot paths only pay for a histogram observe (a lock and a few additions);
+pool and queue gauges are read through callbacks when Prometheus scrapes.
+"""
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import monitoring
+
+# Buckets from sub-millisecond cache hits up to slow LLM replies
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "signaldesk_http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("signaldesk_http_requests_in_flight", "HTTP requests being served")
+
+DB_OPERATION_SECONDS = Histogram(
+    "signaldesk_db_operation_duration_seconds", "MongoDB command latency by collection",
+    ["collection", "operation", "outcome"], buckets=LATENCY_BUCKETS,
+)
+DB_IN_FLIGHT = Gauge("signaldesk_db_operations_in_flight", "MongoDB commands awaiting a reply")
+
+LLM_CALL_SECONDS = Histogram(
+    "signaldesk_llm_call_duration_seconds", "LLM provider call latency",
+    ["outcome"], buckets=LATENCY_BUCKETS,
+)
+SIGNAL_ANALYSIS_SECONDS = Histogram(
+    "signaldesk_signal_analysis_duration_seconds",
+    "Time to obtain a signal analysis (cache, shared call or provider); fallback = pooled analysis served, unavailable = 503",
+    ["outcome"], buckets=LATENCY_BUCKETS,
+)
+SIGNAL_PARSE_FAILURES = Counter(
+    "signaldesk_signal_parse_failures", "Model replies rejected by the signal parser",
+    ["category"],
+)
+LLM_IN_FLIGHT = Gauge("signaldesk_llm_calls_in_flight", "LLM provider calls holding a dispatch slot")
+LLM_QUEUED = Gauge("signaldesk_llm_calls_queued", "LLM calls waiting for a dispatch slot")
+
+PASSWORD_HASH_SECONDS = Histogram(
+    "signaldesk_password_hash_duration_seconds", "bcrypt hash/verify latency on the password pool",
+    ["operation"], buckets=LATENCY_BUCKETS,
+)
+PASSWORD_IN_FLIGHT = Gauge("signaldesk_password_hashes_in_flight", "bcrypt jobs running on the password pool")
+PASSWORD_QUEUED = Gauge("signaldesk_password_hashes_queued", "bcrypt jobs waiting for a pool worker")
+
+PUSH_CONNECTIONS = Gauge("signaldesk_push_connections", "Open WebSocket push sessions")
+
+IDEMPOTENCY_REQUESTS = Counter(
+    "signaldesk_idempotency_requests",
+    "Requests carrying an Idempotency-Key; replayed and coalesced are duplicate calls avoided",
+    ["route", "outcome"],
+)
+
+RATE_LIMITED_REQUESTS = Counter(
+    "signaldesk_rate_limited_requests", "Requests rejected with 429 by plan limits",
+    ["route", "plan", "window"],
+)
+
+JWT_DECODE_SECONDS = Histogram(
+    "signaldesk_jwt_decode_duration_seconds", "Access token decode and verification latency",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+
+class PrometheusMiddleware:
+    """ASGI middleware recording latency per matched route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # The router stores the matched route in scope; template keeps label cardinality bounded
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status_code)
+            ).observe(time.perf_counter() - started)
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """pymongo command listener timing CRUD commands per collection"""
+
+    TIMED_COMMANDS = frozenset((
+        "find", "getMore", "insert", "update", "delete", "findAndModify",
+        "aggregate", "count", "distinct", "createIndexes",
+    ))
+
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        if event.command_name not in self.TIMED_COMMANDS:
+            return
+        target = event.command.get(event.command_name)
+        if not isinstance(target, str):
+            target = event.command.get("collection", "unknown")  # getMore carries the cursor id first
+        self._pending[(event.connection_id, event.request_id)] = (target, event.command_name)
+        DB_IN_FLIGHT.inc()
+
+    def _finish(self, event, outcome: str):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        DB_IN_FLIGHT.dec()
+        DB_OPERATION_SECONDS.labels(pending[0], pending[1], outcome).observe(event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "error")
@@ -0,0 +1,111 @@
+"""
+SignalDesk AI - Outcome resolver
+In-memory index of open signals per asset that decides, tick by tick, which
+signals reached their take-profit or stop-loss level.
+
+Each asset keeps two books ordered so the next level a price move can cross
+always sits at the end of the list:
+
+- `above`: levels that trigger when price >= level (BUY take-profit, SELL
+  stop-loss), lowest level last
+- `below`: levels that trigger when price <= level (BUY stop-loss, SELL
+  take-profit), highest level last
+
+A tick that crosses nothing costs two comparisons; a tick that crosses k
+levels pops k entries. Resolved or discarded signals are dropped lazily when
+their other level surfaces.
+"""
+from bisect import insort
+from typing import Dict, List, Optional, Tuple
+
+HIT_TP = "hit_tp"
+STOPPED_OUT = "stopped_out"
+
+class AssetBook:
+    __slots__ = ("above", "below")
+
+    def __init__(self):
+        # above stores (-level, signal_id, outcome) ascending -> lowest level last
+        self.above: List[Tuple[float, str, str]] = []
+        # below stores (level, signal_id, outcome) ascending -> highest level last
+        self.below: List[Tuple[float, str, str]] = []
+
+class OutcomeResolver:
+    """Tracks open signals and resolves them against incoming prices"""
+
+    def __init__(self):
+        self._books: Dict[str, AssetBook] = {}
+        self._open: Dict[str, str] = {}  # signal_id -> asset
+        self._stale = 0  # rough count of book entries whose signal is no longer open
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def __contains__(self, signal_id: str) -> bool:
+        return signal_id in self._open
+
+    def add(self, signal_id: str, asset: str, side: str,
+            take_profit: Optional[float], stop_loss: Optional[float]):
+        """Start tracking a signal; levels that are missing are simply not watched"""
+        if take_profit is None and stop_loss is None:
+            return
+        book = self._books.get(asset)
+        if book is None:
+            book = self._books[asset] = AssetBook()
+        self._open[signal_id] = asset
+
+        buy = side.upper() != "SELL"
+        if take_profit is not None:
+            if buy:
+                insort(book.above, (-take_profit, signal_id, HIT_TP))
+            else:
+                insort(book.below, (take_profit, signal_id, HIT_TP))
+        if stop_loss is not None:
+            if buy:
+                insort(book.below, (stop_loss, signal_id, STOPPED_OUT))
+            else:
+                insort(book.above, (-stop_loss, signal_id, STOPPED_OUT))
+
+    def discard(self, signal_id: str):
+        """Stop tracking a signal resolved elsewhere (manual update, expiry)"""
+        if self._open.pop(signal_id, None) is not None:
+            self._stale += 2
+
+    def compact(self, min_stale: int = 1024) -> bool:
+        """Drop lazily-deleted entries once they outnumber the open signals"""
+        if self._stale < min_stale or self._stale < len(self._open):
+            return False
+        open_signals = self._open
+        for book in self._books.values():
+            book.above = [entry for entry in book.above if entry[1] in open_signals]
+            book.below = [entry for entry in book.below if entry[1] in open_signals]
+        self._stale = 0
+        return True
+
+    def on_tick(self, asset: str, price: float) -> List[Tuple[str, str]]:
+        """Return (signal_id, outcome) for every open signal this price resolves"""
+        book = self._books.get(asset)
+        if book is None:
+            return []
+        resolved = []
+        open_signals = self._open
+
+        above = book.above
+        while above and -above[-1][0] <= price:
+            _, signal_id, outcome = above.pop()
+            if open_signals.pop(signal_id, None) is not None:
+                resolved.append((signal_id, outcome))
+                self._stale += 1
+            else:
+                self._stale -= 1
+
+        below = book.below
+        while below and below[-1][0] >= price:
+            _, signal_id, outcome = below.pop()
+            if open_signals.pop(signal_id, None) is not None:
+                resolved.append((signal_id, outcome))
+                self._stale += 1
+            else:
+                self._stale -= 1
+
+        return resolved
@@ -0,0 +1,189 @@
+"""
+SignalDesk AI - Real-time push hub
+Fans per-user events (new signals, status transitions, subscription changes)
+out to that user's open WebSocket sessions.
+
+Every connection owns a bounded send queue. An event is encoded once and
+offered to each queue without waiting; a client too slow to keep up fills
+its queue, is marked overflowed and gets disconnected so it can reconnect
+and refetch, instead of buffering without limit.
+
+Brokers decide how events reach the hub. LocalBroker delivers in-process
+(single worker); MongoBroker also appends events to a capped collection and
+tails it, so every worker sharing the database delivers to its own sessions.
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from typing import Dict, Set
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, PyMongoError
+
+def encode_event(event: str, data: dict) -> str:
+    return json.dumps(
+        {"event": event, "data": data},
+        default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value)
+    )
+
+class PushConnection:
+    __slots__ = ("user_id", "queue", "overflowed")
+
+    def __init__(self, user_id: str, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+class PushHub:
+    """In-process registry of push connections per user"""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._connections: Dict[str, Set[PushConnection]] = {}
+        self.connections = 0
+        self.published = 0
+        self.delivered = 0
+        self.overflowed = 0
+
+    def connect(self, user_id: str) -> PushConnection:
+        connection = PushConnection(user_id, self.queue_size)
+        self._connections.setdefault(user_id, set()).add(connection)
+        self.connections += 1
+        return connection
+
+    def disconnect(self, connection: PushConnection):
+        sessions = self._connections.get(connection.user_id)
+        if sessions is None or connection not in sessions:
+            return
+        sessions.discard(connection)
+        if not sessions:
+            del self._connections[connection.user_id]
+        self.connections -= 1
+
+    def publish(self, user_id: str, event: str, data: dict):
+        """Offer an event to every session of user_id without blocking"""
+        sessions = self._connections.get(user_id)
+        if not sessions:
+            return
+        message = encode_event(event, data)
+        self.published += 1
+        for connection in sessions:
+            if connection.overflowed:
+                continue
+            try:
+                connection.queue.put_nowait(message)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                connection.overflowed = True
+                self.overflowed += 1
+
+    async def pump(self, connection: PushConnection, send):
+        """Send queued messages until the connection overflows or send fails"""
+        queue = connection.queue
+        while True:
+            message = await queue.get()
+            if connection.overflowed:
+                return
+            await send(message)
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "users": len(self._connections),
+            "queue_size": self.queue_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflowed": self.overflowed
+        }
+
+class LocalBroker:
+    """Delivers events straight to this process's hub"""
+
+    name = "local"
+
+    def __init__(self, hub: PushHub):
+        self.hub = hub
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, user_id: str, event: str, data: dict):
+        self.hub.publish(user_id, event, data)
+
+    def stats(self) -> dict:
+        return {"broker": self.name}
+
+class MongoBroker(LocalBroker):
+    """Shares events between workers through a tailable capped collection"""
+
+    name = "mongo"
+
+    def __init__(self, hub: PushHub, database, collection_name: str, capped_bytes: int):
+        super().__init__(hub)
+        self.database = database
+        self.collection = database[collection_name]
+        self.capped_bytes = capped_bytes
+        self.origin = uuid.uuid4().hex
+        self._task = None
+        self.relayed = 0
+        self.last_error = None
+
+    async def start(self):
+        try:
+            await self.database.create_collection(
+                self.collection.name, capped=True, size=self.capped_bytes
+            )
+        except CollectionInvalid:
+            pass  # already created by another worker
+        self._task = asyncio.create_task(self._tail())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self, user_id: str, event: str, data: dict):
+        # Local sessions get the event immediately; the tail skips our own writes
+        self.hub.publish(user_id, event, data)
+        await self.collection.insert_one(
+            {"origin": self.origin, "user_id": user_id, "event": event, "data": data}
+        )
+
+    async def _tail(self):
+        """Follow the capped collection from its current end and relay other workers' events"""
+        last_id = None
+        while True:
+            try:
+                if last_id is None:
+                    newest = await self.collection.find_one({}, sort=[("$natural", -1)])
+                    last_id = newest["_id"] if newest else 0
+                query = {"_id": {"$gt": last_id}} if last_id else {}
+                cursor = self.collection.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for doc in cursor:
+                        last_id = doc["_id"]
+                        if doc.get("origin") != self.origin:
+                            self.hub.publish(doc["user_id"], doc["event"], doc["data"])
+                            self.relayed += 1
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                self.last_error = str(e)
+            await asyncio.sleep(1)
+
+    def stats(self) -> dict:
+        return {
+            "broker": self.name,
+            "running": self._task is not None and not self._task.done(),
+            "relayed": self.relayed,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,142 @@
+"""
+SignalDesk AI - Token-bucket rate limiting
+Buckets are keyed by route and user_id and refill continuously at the limit's
+rate up to its burst. A hit either takes `cost` tokens or reports how many
+seconds until enough have refilled (the Retry-After). refund() hands spent
+tokens back, for a request that another of its limits went on to reject.
+
+LocalRateLimiter keeps buckets in this process: a hit is a few float
+operations with no await in between, so on the event loop it is atomic
+without locks. MongoRateLimiter keeps them in a shared collection, refilled
+and spent in one pipeline update, for deployments with several workers.
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, NamedTuple
+
+from pymongo import ReturnDocument
+
+class RateLimit(NamedTuple):
+    rate: float   # tokens per second
+    burst: float  # bucket capacity
+
+    @classmethod
+    def per_minute(cls, count: float, burst: float) -> "RateLimit":
+        return cls(count / 60, burst)
+
+    @classmethod
+    def per_day(cls, count: float) -> "RateLimit":
+        return cls(count / 86400, count)
+
+def parse_plan_limits(spec: str, make) -> Dict[str, RateLimit]:
+    """Parse "plan:n[:m],..." into {plan: make(n[, m])}; "*" is the fallback plan"""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        plan, *numbers = entry.split(":")
+        limits[plan] = make(*(float(number) for number in numbers))
+    return limits
+
+def limit_for_plan(limits: Dict[str, RateLimit], plan: str) -> RateLimit:
+    return limits.get(plan) or limits.get("*")
+
+class LocalRateLimiter:
+    """In-process buckets; the least recently used are dropped past max_keys"""
+
+    name = "local"
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    async def hit(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        """Spend cost tokens; return 0 when allowed, else seconds until they are available"""
+        if cost > limit.burst:
+            self.rejected += 1
+            return float("inf")  # never fits, however long the caller waits
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = limit.burst
+            bucket = self._buckets[key] = [tokens, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+            self._buckets.move_to_end(key)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            self.allowed += 1
+            return 0.0
+        bucket[0] = tokens
+        self.rejected += 1
+        return (cost - tokens) / limit.rate if limit.rate > 0 else float("inf")
+
+    async def refund(self, key: str, limit: RateLimit, cost: float = 1):
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket[0] = min(limit.burst, bucket[0] + cost)
+
+    async def start(self):
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "keys": len(self._buckets),
+            "max_keys": self.max_keys,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.evictions
+        }
+
+class MongoRateLimiter(LocalRateLimiter):
+    """Buckets shared by every worker through one document per key"""
+
+    name = "mongo"
+
+    def __init__(self, collection):
+        super().__init__(max_keys=0)
+        self.collection = collection
+
+    async def start(self):
+        # Idle buckets are full again after burst / rate; drop them after that
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def hit(self, key: str, limit: RateLimit, cost: float = 1) -> float:
+        if cost > limit.burst:
+            self.rejected += 1
+            return float("inf")
+        now = datetime.now(timezone.utc)
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        refilled = {"$min": [limit.burst, {"$add": [{"$ifNull": ["$tokens", limit.burst]}, {"$multiply": [elapsed, limit.rate]}]}]}
+        refill_seconds = limit.burst / limit.rate if limit.rate > 0 else 86400
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"tokens": refilled, "updated_at": now, "expires_at": now + timedelta(seconds=refill_seconds)}},
+                {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc["allowed"]:
+            self.allowed += 1
+            return 0.0
+        self.rejected += 1
+        return (cost - doc["tokens"]) / limit.rate if limit.rate > 0 else float("inf")
+
+    async def refund(self, key: str, limit: RateLimit, cost: float = 1):
+        await self.collection.update_one(
+            {"_id": key},
+            [{"$set": {"tokens": {"$min": [limit.burst, {"$add": ["$tokens", cost]}]}}}]
+        )
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "allowed": self.allowed, "rejected": self.rejected}
@@ -3,29 +3,74 @@ SignalDesk AI - Premium Trading Signal Backend
 FastAPI backend with JWT auth, GPT-5.2 AI signals, and subscription management
 """
 import os
+import csv
+import io
+import json
+import math
+import base64
+import hashlib
 import uuid
+import zlib
 import asyncio
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List
+from collections import OrderedDict, deque
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, WebSocket, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr, Field
 from dotenv import load_dotenv
-from pymongo import MongoClient
+import orjson
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 
+from outcome_resolver import OutcomeResolver, HIT_TP, STOPPED_OUT
+from backtest import BarStore, GROUP_FIELDS, run_backtest, signals_to_arrays, summarize
+from metrics import (
+    PrometheusMiddleware, MongoCommandTimer, JWT_DECODE_SECONDS, LLM_CALL_SECONDS, LLM_IN_FLIGHT,
+    LLM_QUEUED, IDEMPOTENCY_REQUESTS, PASSWORD_HASH_SECONDS, PASSWORD_IN_FLIGHT, PASSWORD_QUEUED, PUSH_CONNECTIONS,
+    RATE_LIMITED_REQUESTS, SIGNAL_ANALYSIS_SECONDS, SIGNAL_PARSE_FAILURES
+)
+from push_hub import PushHub, LocalBroker, MongoBroker
+from rate_limit import LocalRateLimiter, MongoRateLimiter, RateLimit, limit_for_plan, parse_plan_limits
+from signal_parser import SignalParseError, parse_signal
+
 load_dotenv()
 
-# Database setup
+# Database setup (async driver, so queries never block the event loop)
 MONGO_URL = os.environ.get("MONGO_URL")
 DB_NAME = os.environ.get("DB_NAME")
-client = MongoClient(MONGO_URL)
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 0))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", 5000))
+# 0 = no socket timeout: manage.py rebuilds and backtests share this client, and a large
+# $group can take longer than any request-sized timeout to return its first batch
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get("MONGO_SOCKET_TIMEOUT_MS", 0))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+
+client = AsyncIOMotorClient(
+    MONGO_URL,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+    socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+    waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    event_listeners=[MongoCommandTimer()],
+    tz_aware=True,  # timestamps are stored as BSON dates and read back as aware UTC datetimes
+)
 db = client[DB_NAME]
 
 # JWT config
@@ -37,10 +82,131 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES",
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+# bcrypt runs on a dedicated pool so login storms can't freeze the event loop
+PASSWORD_POOL_WORKERS = int(os.environ.get("PASSWORD_POOL_WORKERS", 4))
+PASSWORD_QUEUE_LIMIT = int(os.environ.get("PASSWORD_QUEUE_LIMIT", 64))
+PASSWORD_QUEUE_TIMEOUT_SECONDS = float(os.environ.get("PASSWORD_QUEUE_TIMEOUT_SECONDS", 2.0))
+PASSWORD_RETRY_AFTER_SECONDS = int(os.environ.get("PASSWORD_RETRY_AFTER_SECONDS", 1))
+
+# Authenticated-principal cache (user profile + subscription per user_id)
+PRINCIPAL_CACHE_SIZE = int(os.environ.get("PRINCIPAL_CACHE_SIZE", 10000))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+
+# Freshness window per timeframe for shared LLM analyses (0 disables reuse)
+SIGNAL_CACHE_SIZE = int(os.environ.get("SIGNAL_CACHE_SIZE", 1024))
+SIGNAL_CACHE_TTL_SECONDS = {
+    "Scalp": float(os.environ.get("SIGNAL_CACHE_TTL_SCALP", 60)),
+    "Intraday": float(os.environ.get("SIGNAL_CACHE_TTL_INTRADAY", 300)),
+    "Swing": float(os.environ.get("SIGNAL_CACHE_TTL_SWING", 600)),
+}
+
+# LLM dispatch limits and circuit breaker
+LLM_MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", 8))
+LLM_MAX_QUEUE = int(os.environ.get("LLM_MAX_QUEUE", 100))
+LLM_DEADLINE_SECONDS = float(os.environ.get("LLM_DEADLINE_SECONDS", 20))
+LLM_BREAKER_FAILURES = int(os.environ.get("LLM_BREAKER_FAILURES", 5))
+LLM_BREAKER_RESET_SECONDS = float(os.environ.get("LLM_BREAKER_RESET_SECONDS", 30))
+
+# Watchlist batch generation
+SIGNAL_BATCH_MAX_ITEMS = int(os.environ.get("SIGNAL_BATCH_MAX_ITEMS", 20))
+SIGNAL_BATCH_CONCURRENCY = int(os.environ.get("SIGNAL_BATCH_CONCURRENCY", 4))
+
+# Signal list pagination
+SIGNALS_MAX_PAGE_SIZE = int(os.environ.get("SIGNALS_MAX_PAGE_SIZE", 100))
+
+# History export: documents per cursor batch and bytes buffered per streamed chunk
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+EXPORT_CHUNK_BYTES = int(os.environ.get("EXPORT_CHUNK_BYTES", 64 * 1024))
+
+# Performance timeseries: default and longest window served from the daily rollups
+PERFORMANCE_TIMESERIES_DEFAULT_DAYS = int(os.environ.get("PERFORMANCE_TIMESERIES_DEFAULT_DAYS", 30))
+PERFORMANCE_TIMESERIES_MAX_DAYS = int(os.environ.get("PERFORMANCE_TIMESERIES_MAX_DAYS", 366))
+
+# Background expiry sweeper
+EXPIRY_SWEEP_INTERVAL_SECONDS = float(os.environ.get("EXPIRY_SWEEP_INTERVAL_SECONDS", 60))
+EXPIRY_SWEEP_BATCH_SIZE = int(os.environ.get("EXPIRY_SWEEP_BATCH_SIZE", 500))
+EXPIRY_SWEEP_MAX_BATCHES = int(os.environ.get("EXPIRY_SWEEP_MAX_BATCHES", 20))
+
+# Fallback pool: recent real analyses per asset/timeframe served when the model is unreachable
+FALLBACK_REFRESH_INTERVAL_SECONDS = float(os.environ.get("FALLBACK_REFRESH_INTERVAL_SECONDS", 60))
+FALLBACK_MAX_AGE_SECONDS = float(os.environ.get("FALLBACK_MAX_AGE_SECONDS", 6 * 3600))
+FALLBACK_REFRESH_BATCH_SIZE = int(os.environ.get("FALLBACK_REFRESH_BATCH_SIZE", 1000))
+
+# Outcome tracking from a local price tick replay (disabled when no file is set)
+PRICE_FEED_REPLAY_FILE = os.environ.get("PRICE_FEED_REPLAY_FILE")
+PRICE_FEED_REPLAY_RATE = float(os.environ.get("PRICE_FEED_REPLAY_RATE", 0))
+OUTCOME_FLUSH_INTERVAL_SECONDS = float(os.environ.get("OUTCOME_FLUSH_INTERVAL_SECONDS", 1.0))
+OUTCOME_FLUSH_SIZE = int(os.environ.get("OUTCOME_FLUSH_SIZE", 500))
+
+# Historical OHLC bars for /api/performance/backtest (disabled when unset)
+BACKTEST_BARS_DIR = os.environ.get("BACKTEST_BARS_DIR")
+
+# Client caching of the static asset catalogue
+ASSET_CACHE_MAX_AGE_SECONDS = int(os.environ.get("ASSET_CACHE_MAX_AGE_SECONDS", 3600))
+
+# Release identifier (e.g. the git SHA); part of every user ETag, so a deploy invalidates them
+BUILD_ID = os.environ.get("BUILD_ID", "")
+
+# Real-time push over WebSocket (PUSH_BROKER=mongo shares events between workers)
+PUSH_QUEUE_SIZE = int(os.environ.get("PUSH_QUEUE_SIZE", 64))
+PUSH_BROKER = os.environ.get("PUSH_BROKER", "local")
+PUSH_EVENTS_CAPPED_BYTES = int(os.environ.get("PUSH_EVENTS_CAPPED_BYTES", 16 * 1024 * 1024))
+
+# Idempotency-Key replay window, how long a duplicate waits on another worker's original,
+# and after how long an unfinished original is presumed dead and taken over
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", 86400))
+IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", 30))
+IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS = float(os.environ.get("IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS", 120))
+
+# Signal generation limits per subscription plan ("*" covers unlisted plans).
+# Token buckets "plan:per_minute:burst" plus a rolling daily quota "plan:per_day";
+# a batch spends one token per item, so every plan's burst should cover SIGNAL_BATCH_MAX_ITEMS.
+# RATE_LIMIT_BACKEND=mongo shares buckets between workers.
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "local")
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", 100000))
+RATE_LIMIT_GENERATE = os.environ.get("RATE_LIMIT_GENERATE", "premium_trial:6:20,premium:30:20,*:30:20")
+GENERATION_DAILY_QUOTA = os.environ.get("GENERATION_DAILY_QUOTA", "premium_trial:50,premium:1000,*:1000")
+
 # Collections
 users_collection = db["users"]
 signals_collection = db["signals"]
 subscriptions_collection = db["subscriptions"]
+performance_collection = db["performance_stats"]
+daily_collection = db["performance_daily"]
+idempotency_collection = db["idempotency_keys"]
+
+SIGNAL_STATUSES = ("active", "hit_tp", "stopped_out", "expired")
+
+ASSET_CATALOGUE = {
+    "assets": [
+        {"symbol": "BTCUSDT", "name": "Bitcoin", "category": "Crypto"},
+        {"symbol": "ETHUSDT", "name": "Ethereum", "category": "Crypto"},
+        {"symbol": "SOLUSDT", "name": "Solana", "category": "Crypto"},
+        {"symbol": "SPY", "name": "S&P 500 ETF", "category": "Stocks"},
+        {"symbol": "QQQ", "name": "Nasdaq ETF", "category": "Stocks"},
+        {"symbol": "AAPL", "name": "Apple Inc", "category": "Stocks"},
+        {"symbol": "EURUSD", "name": "Euro/USD", "category": "Forex"},
+        {"symbol": "GBPUSD", "name": "GBP/USD", "category": "Forex"},
+        {"symbol": "XAUUSD", "name": "Gold", "category": "Commodities"}
+    ],
+    "timeframes": ["Scalp", "Intraday", "Swing"]
+}
+CATALOGUE_KEYS = frozenset(
+    (asset["symbol"], timeframe) for asset in ASSET_CATALOGUE["assets"] for timeframe in ASSET_CATALOGUE["timeframes"]
+)
+# Static catalogue: serialized and hashed once, cacheable by clients and proxies
+ASSET_CATALOGUE_JSON = json.dumps(ASSET_CATALOGUE, separators=(",", ":"))
+ASSET_CATALOGUE_ETAG = f'"{hashlib.blake2b(ASSET_CATALOGUE_JSON.encode(), digest_size=8).hexdigest()}"'
+ASSET_CACHE_CONTROL = f"public, max-age={ASSET_CACHE_MAX_AGE_SECONDS}"
+PRIVATE_REVALIDATE = "private, no-cache"
+SIGNAL_FIELDS = (
+    "signal_id", "asset", "signal", "entry", "take_profit", "stop_loss", "confidence",
+    "timeframe", "status", "ai_reasoning", "risk_reward", "source", "created_at", "expires_at", "updated_at"
+)
+SIGNAL_RESPONSE_FIELDS = (
+    "asset", "signal", "entry", "take_profit", "stop_loss", "confidence", "timeframe",
+    "status", "ai_reasoning", "risk_reward", "source", "created_at", "expires_at"
+)
 
 # Pydantic Models
 class UserRegister(BaseModel):
@@ -64,7 +230,7 @@ class SignalRequest(BaseModel):
 class SubscriptionUpdate(BaseModel):
     is_active: bool
     plan: str = "premium"
-    expires_at: Optional[str] = None
+    expires_at: Optional[datetime] = None
 
 class SignalResponse(BaseModel):
     id: str
@@ -78,8 +244,73 @@ class SignalResponse(BaseModel):
     status: str
     ai_reasoning: str
     risk_reward: str
-    created_at: str
-    expires_at: str
+    source: str = Field(description="model, or fallback when reused from a recent analysis")
+    created_at: datetime
+    expires_at: datetime
+
+class StoredSignal(BaseModel):
+    """A signal document as listed; fields outside a `fields=` projection are omitted"""
+    signal_id: str
+    user_id: Optional[str] = None
+    asset: Optional[str] = None
+    signal: Optional[str] = None
+    entry: Optional[float] = None
+    take_profit: Optional[List[float]] = None
+    stop_loss: Optional[float] = None
+    confidence: Optional[int] = None
+    timeframe: Optional[str] = None
+    status: Optional[str] = None
+    ai_reasoning: Optional[str] = None
+    risk_reward: Optional[str] = None
+    source: Optional[str] = None
+    created_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class SignalListResponse(BaseModel):
+    signals: List[StoredSignal]
+    count: int
+    next_cursor: Optional[str] = None
+
+class PerformanceResponse(BaseModel):
+    total_signals: int
+    win_rate: float
+    active_signals: int
+    hit_tp: int
+    stopped_out: int
+    avg_confidence: float
+
+class PerformancePoint(PerformanceResponse):
+    start: datetime
+
+class PerformanceTimeseriesResponse(BaseModel):
+    interval: str
+    since: datetime
+    until: datetime
+    points: List[PerformancePoint]
+    totals: PerformanceResponse
+
+class DashboardResponse(BaseModel):
+    subscription: dict
+    active_signals: int
+    total_signals: int
+    ai_confidence: float
+    recent_signals: List[StoredSignal]
+    last_signal_at: Optional[datetime] = None
+
+class SignalBatchRequest(BaseModel):
+    items: List[SignalRequest] = Field(..., min_length=1, max_length=SIGNAL_BATCH_MAX_ITEMS)
+
+class SignalBatchItem(BaseModel):
+    asset: str
+    timeframe: str
+    signal: Optional[SignalResponse] = None
+    error: Optional[str] = None
+
+class SignalBatchResponse(BaseModel):
+    results: List[SignalBatchItem]
+    succeeded: int
+    failed: int
 
 # Helper functions
 def hash_password(password: str) -> str:
@@ -88,6 +319,160 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def as_utc_datetime(value) -> datetime:
+    """Aware UTC datetime from a stored/received timestamp (datetime or legacy ISO string)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def to_iso(value) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+class PasswordWorkPool:
+    """Size-limited thread pool for bcrypt work with queue admission control"""
+
+    def __init__(self, workers: int, queue_limit: int, queue_timeout: float):
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.slots = asyncio.Semaphore(workers)
+        self.queue_limit = queue_limit
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _overloaded(self) -> HTTPException:
+        self.rejected += 1
+        return HTTPException(
+            status_code=503,
+            detail="Authentication service busy, please retry",
+            headers={"Retry-After": str(PASSWORD_RETRY_AFTER_SECONDS)}
+        )
+
+    async def run(self, func, *args):
+        """Run func on the pool, queueing up to queue_timeout or rejecting with 503"""
+        if self.waiting >= self.queue_limit:
+            raise self._overloaded()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._overloaded()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            PASSWORD_HASH_SECONDS.labels(func.__name__).observe(elapsed)
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+            self.slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_latency_ms": round(self.total_seconds / self.completed * 1000, 2) if self.completed else 0,
+            "max_latency_ms": round(self.max_seconds * 1000, 2)
+        }
+
+password_pool = PasswordWorkPool(PASSWORD_POOL_WORKERS, PASSWORD_QUEUE_LIMIT, PASSWORD_QUEUE_TIMEOUT_SECONDS)
+PASSWORD_IN_FLIGHT.set_function(lambda: password_pool.in_flight)
+PASSWORD_QUEUED.set_function(lambda: password_pool.waiting)
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after a fixed TTL.
+
+    Loaders that await between reading the source and calling set() pass the
+    generation() they started at; the set is dropped if the key was
+    invalidated in the meantime, so a write racing a load can't be undone.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Generation each recently invalidated key was last invalidated at (bounded like _entries)
+        self._invalidated = OrderedDict()
+        self._generation = 0
+        self._forgotten = 0  # newest invalidation dropped from _invalidated
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_sets = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self) -> int:
+        return self._generation
+
+    def set(self, key, value, ttl: Optional[float] = None, generation: Optional[int] = None):
+        if generation is not None and (
+            self._invalidated.get(key, 0) > generation or self._forgotten > generation
+        ):
+            self.stale_sets += 1
+            return
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+        self._generation += 1
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        if len(self._invalidated) > self.maxsize:
+            _, self._forgotten = self._invalidated.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self._invalidated.clear()
+        self._generation += 1
+        self._forgotten = self._generation
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "stale_sets": self.stale_sets,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0
+        }
+
+principal_cache = TTLCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -95,22 +480,44 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+    return await authenticate_token(credentials.credentials)
+
+async def authenticate_token(token: str) -> dict:
+    """Resolve a bearer token to its user profile or raise 401"""
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        with JWT_DECODE_SECONDS.time():
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
-        user = users_collection.find_one({"user_id": user_id}, {"_id": 0, "password": 0})
-        if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
+        principal = principal_cache.get(user_id) or {}
+        if "user" not in principal:
+            generation = principal_cache.generation()
+            user = await users_collection.find_one({"user_id": user_id}, {"_id": 0, "password": 0})
+            if user is None:
+                raise HTTPException(status_code=401, detail="User not found")
+            principal = {**principal, "user": user}
+            principal_cache.set(user_id, principal, generation=generation)
+        return principal["user"]
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-def check_subscription(user_id: str) -> dict:
+async def check_subscription(user_id: str) -> dict:
     """Check if user has active subscription (mocked for testing)"""
-    sub = subscriptions_collection.find_one({"user_id": user_id}, {"_id": 0})
+    principal = principal_cache.get(user_id) or {}
+    if "subscription" not in principal:
+        # Skip caching if activate/cancel invalidated the entry while this load was pending
+        generation = principal_cache.generation()
+        principal = {**principal, "subscription": await load_subscription(user_id)}
+        principal_cache.set(user_id, principal, generation=generation)
+    subscription = principal["subscription"]
+    expires_at = subscription.get("expires_at")
+    if subscription.get("is_active") and expires_at and as_utc_datetime(expires_at) <= datetime.now(timezone.utc):
+        return {**subscription, "is_active": False, "expired": True}
+    return subscription
+
+async def load_subscription(user_id: str) -> dict:
+    sub = await subscriptions_collection.find_one({"user_id": user_id}, {"_id": 0})
     if sub:
         return sub
     # Default mock subscription for testing
@@ -119,26 +526,59 @@ def check_subscription(user_id: str) -> dict:
         "is_active": True,
         "plan": "premium_mock",
         "price": 49.99,
-        "expires_at": (datetime.now(timezone.utc) + timedelta(days=30)).isoformat(),
+        "expires_at": datetime.now(timezone.utc) + timedelta(days=30),
         "mock": True
     }
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    users_collection.create_index("email", unique=True)
-    users_collection.create_index("user_id", unique=True)
-    signals_collection.create_index("user_id")
-    signals_collection.create_index("created_at")
+    await users_collection.create_index("email", unique=True)
+    await users_collection.create_index("user_id", unique=True)
+    # Point reads and updates by signal_id (detail, status PATCH, bulk resolutions)
+    await signals_collection.create_index("signal_id", unique=True)
+    # Lists and dashboard: user_id + created_at order, with signal_id as the keyset tie-breaker
+    await signals_collection.create_index([("user_id", 1), ("created_at", -1), ("signal_id", -1)])
+    # Same order filtered by status (active counts, status filter) or by asset
+    await signals_collection.create_index([("user_id", 1), ("status", 1), ("created_at", -1), ("signal_id", -1)])
+    await signals_collection.create_index([("user_id", 1), ("asset", 1), ("created_at", -1), ("signal_id", -1)])
+    # The compound indexes above replace the old single-field user_id index
+    if "user_id_1" in await signals_collection.index_information():
+        try:
+            await signals_collection.drop_index("user_id_1")
+        except OperationFailure as e:
+            if e.code != 27:  # IndexNotFound: another worker dropped it first
+                raise
+    # Expiry sweeper: active signals ordered by expires_at
+    await signals_collection.create_index([("status", 1), ("expires_at", 1)])
+    # Fallback pool refresh: signals created since its last pass, across users
+    await signals_collection.create_index("created_at")
+    await subscriptions_collection.create_index("user_id", unique=True)
+    await performance_collection.create_index("user_id", unique=True)
+    # Daily rollups: one bucket per user, UTC day, asset and timeframe; timeseries reads a day range
+    await daily_collection.create_index([("user_id", 1), ("day", 1), ("asset", 1), ("timeframe", 1)], unique=True)
+    # Stored Idempotency-Key responses expire after the replay window
+    await idempotency_collection.create_index("created_at", expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS)
+    await push_broker.start()
+    await rate_limiter.start()
+    expiry_sweeper.start()
+    fallback_pool.start()
+    await outcome_tracker.start()
     yield
     # Shutdown
+    await outcome_tracker.stop()
+    await push_broker.stop()
+    await expiry_sweeper.stop()
+    await fallback_pool.stop()
     client.close()
+    password_pool.executor.shutdown(wait=False)
 
 app = FastAPI(
     title="SignalDesk AI API",
     description="Premium AI Trading Signal Generation",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -148,11 +588,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(PrometheusMiddleware)
 
 # Auth endpoints
 @app.post("/api/auth/register", response_model=TokenResponse)
 async def register(user_data: UserRegister):
-    existing = users_collection.find_one({"email": user_data.email})
+    existing = await users_collection.find_one({"email": user_data.email})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -161,10 +602,10 @@ async def register(user_data: UserRegister):
         "user_id": user_id,
         "email": user_data.email,
         "name": user_data.name,
-        "password": hash_password(user_data.password),
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "password": await password_pool.run(hash_password, user_data.password),
+        "created_at": datetime.now(timezone.utc)
     }
-    users_collection.insert_one(user_doc)
+    await users_collection.insert_one(user_doc)
     
     # Create mock subscription
     sub_doc = {
@@ -172,10 +613,11 @@ async def register(user_data: UserRegister):
         "is_active": True,
         "plan": "premium_trial",
         "price": 49.99,
-        "expires_at": (datetime.now(timezone.utc) + timedelta(days=7)).isoformat(),
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "expires_at": datetime.now(timezone.utc) + timedelta(days=7),
+        "created_at": datetime.now(timezone.utc)
     }
-    subscriptions_collection.insert_one(sub_doc)
+    await subscriptions_collection.insert_one(sub_doc)
+    principal_cache.invalidate(user_id)
     
     token = create_access_token({"sub": user_id})
     return TokenResponse(
@@ -185,8 +627,8 @@ async def register(user_data: UserRegister):
 
 @app.post("/api/auth/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
-    user = users_collection.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password"]):
+    user = await users_collection.find_one({"email": credentials.email})
+    if not user or not await password_pool.run(verify_password, credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     token = create_access_token({"sub": user["user_id"]})
@@ -197,21 +639,11 @@ async def login(credentials: UserLogin):
 
 @app.get("/api/auth/me")
 async def get_me(user: dict = Depends(get_current_user)):
-    subscription = check_subscription(user["user_id"])
+    subscription = await check_subscription(user["user_id"])
     return {**user, "subscription": subscription}
 
-# Signal endpoints
-@app.post("/api/signals/generate", response_model=SignalResponse)
-async def generate_signal(request: SignalRequest, user: dict = Depends(get_current_user)):
-    """Generate AI trading signal using GPT-5.2"""
-    subscription = check_subscription(user["user_id"])
-    if not subscription.get("is_active"):
-        raise HTTPException(status_code=403, detail="Active subscription required")
-    
-    api_key = os.environ.get("EMERGENT_LLM_KEY")
-    session_id = f"signal_{user['user_id']}_{uuid.uuid4()}"
-    
-    system_prompt = """You are an elite quantitative trading AI analyst. Generate precise trading signals based on technical and fundamental analysis.
+# AI signal analysis
+SIGNAL_SYSTEM_PROMPT = """You are an elite quantitative trading AI analyst. Generate precise trading signals based on technical and fundamental analysis.
 
 IMPORTANT: Respond ONLY with valid JSON in this exact format:
 {
@@ -226,262 +658,1658 @@ IMPORTANT: Respond ONLY with valid JSON in this exact format:
 
 Base your analysis on realistic market conditions. For crypto, use realistic price ranges. For stocks/forex, use appropriate prices."""
 
-    chat = LlmChat(
-        api_key=api_key,
-        session_id=session_id,
-        system_message=system_prompt
+class SingleFlight:
+    """Coalesces concurrent calls for the same key onto one shared task"""
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def run(self, key, func):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.calls += 1
+        else:
+            self.shared += 1
+        # Shield so one disconnecting caller doesn't cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    def pending(self, key) -> bool:
+        return key in self._inflight
+
+    def _finish(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+class LlmUnavailable(Exception):
+    """Raised when the dispatcher sheds a call instead of reaching the provider"""
+
+class LlmDispatcher:
+    """Gateway to the LLM provider: in-flight cap, FIFO wait queue, deadline, circuit breaker"""
+
+    def __init__(self, max_in_flight: int, max_queue: int, deadline: float,
+                 failure_threshold: int, reset_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._waiters = deque()
+        self.in_flight = 0
+        # Breaker state: closed -> open after N consecutive failures -> half_open probe
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        # Counters
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected_open = 0
+        self.rejected_busy = 0
+        self.wait_count = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.call_seconds = 0.0
+        self.max_call_seconds = 0.0
+
+    async def call(self, func):
+        """Await func() within the deadline, or raise LlmUnavailable without calling it"""
+        self._admit()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            await self._acquire(self.deadline)
+        except BaseException:
+            self._probing = False
+            raise
+        waited = loop.time() - started
+        self.wait_count += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        call_started = loop.time()
+        outcome = "error"
+        try:
+            result = await asyncio.wait_for(func(), timeout=max(self.deadline - waited, 0.001))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            outcome = "timeout"
+            self._record_failure()
+            raise
+        except asyncio.CancelledError:
+            self._probing = False
+            outcome = "cancelled"
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        else:
+            self._record_success()
+            outcome = "success"
+            return result
+        finally:
+            elapsed = loop.time() - call_started
+            LLM_CALL_SECONDS.labels(outcome).observe(elapsed)
+            self.calls += 1
+            self.call_seconds += elapsed
+            self.max_call_seconds = max(self.max_call_seconds, elapsed)
+            self._release()
+
+    def _admit(self):
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected_open += 1
+                raise LlmUnavailable("circuit open")
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probing:
+                self.rejected_open += 1
+                raise LlmUnavailable("circuit half-open, probe in flight")
+            self._probing = True
+
+    def _record_success(self):
+        self.consecutive_failures = 0
+        self.state = "closed"
+        self._probing = False
+
+    def _record_failure(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    async def _acquire(self, timeout: float):
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_busy += 1
+            raise LlmUnavailable("dispatch queue full")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed to us just as we gave up; pass it on
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.rejected_busy += 1
+                raise LlmUnavailable("timed out waiting for an LLM slot")
+            raise
+
+    def _release(self):
+        # Hand the slot straight to the oldest live waiter to keep the queue FIFO
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected_open": self.rejected_open,
+            "rejected_busy": self.rejected_busy,
+            "avg_wait_ms": round(self.wait_seconds / self.wait_count * 1000, 2) if self.wait_count else 0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+            "avg_call_ms": round(self.call_seconds / self.calls * 1000, 2) if self.calls else 0,
+            "max_call_ms": round(self.max_call_seconds * 1000, 2)
+        }
+
+llm_dispatcher = LlmDispatcher(
+    LLM_MAX_IN_FLIGHT, LLM_MAX_QUEUE, LLM_DEADLINE_SECONDS,
+    LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS
+)
+LLM_IN_FLIGHT.set_function(lambda: llm_dispatcher.in_flight)
+LLM_QUEUED.set_function(lambda: len(llm_dispatcher._waiters))
+signal_flights = SingleFlight()
+signal_analysis_cache = TTLCache(SIGNAL_CACHE_SIZE, 0)
+
+def create_signal_chat(asset: str, timeframe: str):
+    """Build the LlmChat session used for one asset/timeframe analysis"""
+    return LlmChat(
+        api_key=os.environ.get("EMERGENT_LLM_KEY"),
+        session_id=f"signal_{asset}_{timeframe}_{uuid.uuid4()}",
+        system_message=SIGNAL_SYSTEM_PROMPT
     ).with_model("openai", "gpt-5.2")
-    
-    user_message = UserMessage(
-        text=f"Generate a trading signal for {request.asset} on {request.timeframe} timeframe. Current market shows mixed momentum. Provide entry, take-profit levels, stop-loss, and confidence score."
+
+def signal_prompt(asset: str, timeframe: str) -> UserMessage:
+    return UserMessage(
+        text=f"Generate a trading signal for {asset} on {timeframe} timeframe. Current market shows mixed momentum. Provide entry, take-profit levels, stop-loss, and confidence score."
     )
-    
+
+signal_parse_failures = {}
+
+def parse_signal_reply(response: str) -> dict:
+    """Extract and validate the signal object from a model reply, counting failures by category"""
     try:
-        response = await chat.send_message(user_message)
-        
-        # Parse JSON response
-        import json
-        import re
-        
-        # Extract JSON from response
-        json_match = re.search(r'\{[\s\S]*\}', response)
-        if json_match:
-            signal_data = json.loads(json_match.group())
+        return parse_signal(response)
+    except SignalParseError as e:
+        signal_parse_failures[e.category] = signal_parse_failures.get(e.category, 0) + 1
+        SIGNAL_PARSE_FAILURES.labels(e.category).inc()
+        raise
+
+def remember_signal_analysis(asset: str, timeframe: str, signal_data: dict):
+    fallback_pool.record(asset, timeframe, signal_data, datetime.now(timezone.utc))
+    ttl = SIGNAL_CACHE_TTL_SECONDS.get(timeframe, 0)
+    if ttl > 0:
+        signal_analysis_cache.set((asset, timeframe), signal_data, ttl=ttl)
+
+async def fetch_signal_analysis(asset: str, timeframe: str) -> dict:
+    """Ask the model for a fresh asset/timeframe analysis and parse its JSON"""
+    chat = create_signal_chat(asset, timeframe)
+    user_message = signal_prompt(asset, timeframe)
+    response = await llm_dispatcher.call(lambda: chat.send_message(user_message))
+    signal_data = parse_signal_reply(response)
+    remember_signal_analysis(asset, timeframe, signal_data)
+    return signal_data
+
+async def stream_signal_analysis(asset: str, timeframe: str, on_chunk) -> dict:
+    """Like fetch_signal_analysis, but hands each reply chunk to on_chunk as it arrives"""
+    chat = create_signal_chat(asset, timeframe)
+    user_message = signal_prompt(asset, timeframe)
+
+    async def consume() -> str:
+        stream_message = getattr(chat, "stream_message", None)
+        if stream_message is None:
+            # Client without token streaming: forward the whole reply as one chunk
+            response = await chat.send_message(user_message)
+            on_chunk(response)
+            return response
+        parts = []
+        async for chunk in stream_message(user_message):
+            parts.append(chunk)
+            on_chunk(chunk)
+        return "".join(parts)
+
+    response = await llm_dispatcher.call(consume)
+    signal_data = parse_signal_reply(response)
+    remember_signal_analysis(asset, timeframe, signal_data)
+    return signal_data
+
+class ChunkFanout:
+    """Copies an in-flight streamed reply to every stream that joined it, replaying what it missed"""
+
+    def __init__(self):
+        self.chunks = []
+        self._listeners = []
+
+    def publish(self, chunk: str):
+        self.chunks.append(chunk)
+        for listener in self._listeners:
+            listener(chunk)
+
+    def subscribe(self, listener):
+        for chunk in self.chunks:
+            listener(chunk)
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+# Streamed model calls in flight, by the same (asset, timeframe) key as signal_flights
+signal_fanouts = {}
+
+async def stream_shared_signal_analysis(asset: str, timeframe: str, on_chunk) -> dict:
+    """Join or start the asset/timeframe model call through signal_flights, streaming its chunks.
+
+    Joining a non-streamed call (from /generate or a batch) yields no chunks,
+    only the result, like a cache hit.
+    """
+    key = (asset, timeframe)
+    fanout = signal_fanouts.get(key)
+    if fanout is None and not signal_flights.pending(key):
+        fanout = signal_fanouts[key] = ChunkFanout()
+
+    async def fetch():
+        # Only runs when nothing was in flight, i.e. for the fanout created above
+        try:
+            return await stream_signal_analysis(asset, timeframe, fanout.publish)
+        finally:
+            if signal_fanouts.get(key) is fanout:
+                del signal_fanouts[key]
+
+    if fanout is not None:
+        fanout.subscribe(on_chunk)
+    try:
+        return await signal_flights.run(key, fetch)
+    finally:
+        if fanout is not None:
+            fanout.unsubscribe(on_chunk)
+
+async def get_signal_analysis(asset: str, timeframe: str) -> dict:
+    """Reuse a fresh analysis or join the in-flight model call for asset/timeframe"""
+    key = (asset, timeframe)
+    signal_data = signal_analysis_cache.get(key)
+    if signal_data is not None:
+        return signal_data
+    return await signal_flights.run(key, lambda: fetch_signal_analysis(asset, timeframe))
+
+def signal_analysis_stats() -> dict:
+    cache = signal_analysis_cache.stats()
+    return {
+        "model_calls": signal_flights.calls,
+        "coalesced": signal_flights.shared,
+        "cache_hits": cache["hits"],
+        "cache_hit_rate": cache["hit_rate"],
+        "saved_calls": signal_flights.shared + cache["hits"],
+        "cached_keys": cache["size"],
+        "parse_failures": dict(signal_parse_failures)
+    }
+
+def build_signal_doc(user_id: str, request: SignalRequest, signal_data: dict) -> dict:
+    """Turn a validated model analysis (see signal_parser.SignalReply) into a stored signal document"""
+    created_at = datetime.now(timezone.utc)
+    expires_at = created_at + timedelta(hours=24 if request.timeframe == "Swing" else 8 if request.timeframe == "Intraday" else 2)
+    return {
+        "signal_id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "asset": request.asset,
+        "signal": signal_data["signal"],
+        "entry": signal_data["entry"],
+        "take_profit": signal_data["take_profit"],
+        "stop_loss": signal_data["stop_loss"],
+        "confidence": signal_data["confidence"],
+        "timeframe": request.timeframe,
+        "status": "active",
+        "ai_reasoning": signal_data["reasoning"],
+        "risk_reward": signal_data["risk_reward"],
+        "source": "model",
+        "created_at": created_at,
+        "expires_at": expires_at
+    }
+
+def build_fallback_signal_doc(user_id: str, request: SignalRequest) -> Optional[dict]:
+    """Signal reusing a recent real analysis of the asset when the AI call fails, if the pool has one"""
+    signal_data = fallback_pool.pick(request.asset, request.timeframe)
+    if signal_data is None:
+        return None
+    return {**build_signal_doc(user_id, request, signal_data), "source": "fallback"}
+
+def analysis_unavailable(asset: str) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Signal analysis for {asset} is temporarily unavailable",
+        headers={"Retry-After": str(math.ceil(LLM_BREAKER_RESET_SECONDS))}
+    )
+
+def signal_payload(signal_doc: dict) -> dict:
+    """SignalResponse-shaped dict taken straight from a signal document we built or stored.
+
+    Routes hand it to ORJSONResponse, skipping model construction and validation.
+    """
+    payload = {"id": signal_doc["signal_id"]}
+    for field in SIGNAL_RESPONSE_FIELDS:
+        payload[field] = signal_doc[field]
+    return payload
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+# Performance rollups: one document per user, maintained with $inc
+async def store_signals(signal_docs: List[dict]):
+    """Insert new signal documents for one user and bump their rollup"""
+    if len(signal_docs) == 1:
+        await signals_collection.insert_one(signal_docs[0])
+    else:
+        await signals_collection.insert_many(signal_docs, ordered=False)
+
+    increments = {"total_signals": len(signal_docs), "confidence_sum": 0, "version": 1}
+    for doc in signal_docs:
+        increments["confidence_sum"] += doc.get("confidence", 0)
+        path = f"status.{doc['status']}"
+        increments[path] = increments.get(path, 0) + 1
+    await performance_collection.update_one(
+        {"user_id": signal_docs[0]["user_id"]},
+        {"$inc": increments},
+        upsert=True
+    )
+    daily = {}
+    for doc in signal_docs:
+        bucket = daily.setdefault(daily_bucket_key(doc), {"total_signals": 0, "confidence_sum": 0})
+        bucket["total_signals"] += 1
+        bucket["confidence_sum"] += doc.get("confidence", 0)
+        path = f"status.{doc['status']}"
+        bucket[path] = bucket.get(path, 0) + 1
+    await inc_daily_buckets(daily)
+    for doc in signal_docs:
+        outcome_tracker.track(doc)
+        await push_broker.publish(doc["user_id"], "signal.created", signal_payload(doc))
+
+async def move_status_rollup(signal: dict, new_status: str):
+    """Move one signal (its pre-update document) between status counts in both rollups"""
+    old_status = signal.get("status", "active")
+    increments = {"version": 1}
+    if old_status != new_status:
+        increments.update({f"status.{old_status}": -1, f"status.{new_status}": 1})
+        await inc_daily_buckets({daily_bucket_key(signal): {f"status.{old_status}": -1, f"status.{new_status}": 1}})
+    await performance_collection.update_one({"user_id": signal["user_id"]}, {"$inc": increments}, upsert=True)
+
+# Daily rollups: performance_daily holds the same counters as performance_stats per
+# (user_id, UTC day, asset, timeframe). A signal stays in the bucket of the day it was
+# created, so status changes move counts within that bucket and a rebuild from the raw
+# signals reproduces it exactly.
+DAILY_BUCKET_FIELDS = {"_id": 0, "signal_id": 1, "user_id": 1, "asset": 1, "timeframe": 1, "created_at": 1}
+
+def utc_day(value) -> datetime:
+    value = as_utc_datetime(value)
+    return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+
+def daily_bucket_key(signal: dict) -> tuple:
+    return signal["user_id"], utc_day(signal["created_at"]), signal.get("asset"), signal.get("timeframe")
+
+async def inc_daily_buckets(increments: Dict[tuple, dict]):
+    """Apply {bucket key: {field: delta}} to performance_daily in one unordered bulk write"""
+    if increments:
+        await daily_collection.bulk_write([
+            UpdateOne(
+                {"user_id": user_id, "day": day, "asset": asset, "timeframe": timeframe},
+                {"$inc": inc},
+                upsert=True
+            )
+            for (user_id, day, asset, timeframe), inc in increments.items()
+        ], ordered=False)
+
+async def rebuild_performance_rollups(user_id: Optional[str] = None) -> List[dict]:
+    """Recompute rollups from the raw signals without writing them"""
+    match = {"user_id": user_id} if user_id else {}
+    pipeline = [
+        {"$match": match},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "status": "$status"},
+            "count": {"$sum": 1},
+            "confidence_sum": {"$sum": {"$ifNull": ["$confidence", 0]}}
+        }}
+    ]
+    rollups = {}
+    async for row in signals_collection.aggregate(pipeline):
+        uid = row["_id"]["user_id"]
+        rollup = rollups.setdefault(uid, {"user_id": uid, "total_signals": 0, "confidence_sum": 0, "status": {}})
+        rollup["total_signals"] += row["count"]
+        rollup["confidence_sum"] += row["confidence_sum"]
+        rollup["status"][row["_id"]["status"]] = row["count"]
+    return list(rollups.values())
+
+async def resolve_active_signals(signals: List[dict], new_status: str, now: Optional[datetime] = None) -> int:
+    """Move still-active signals ({signal_id, user_id}) to new_status in bulk and fix rollups.
+
+    Passing the DAILY_BUCKET_FIELDS too saves re-reading them when every signal moves.
+    """
+    now = now or datetime.now(timezone.utc)
+    by_user = {}
+    for doc in signals:
+        by_user.setdefault(doc["user_id"], []).append(doc)
+
+    changed = 0
+    for user_id, docs in by_user.items():
+        signal_ids = [doc["signal_id"] for doc in docs]
+        # Re-check status so a concurrent manual update isn't double counted
+        result = await signals_collection.update_many(
+            {"user_id": user_id, "signal_id": {"$in": signal_ids}, "status": "active"},
+            {"$set": {"status": new_status, "updated_at": now}}
+        )
+        if result.modified_count:
+            await performance_collection.update_one(
+                {"user_id": user_id},
+                {"$inc": {
+                    "status.active": -result.modified_count,
+                    f"status.{new_status}": result.modified_count,
+                    "version": 1
+                }},
+                upsert=True
+            )
+            if result.modified_count < len(signal_ids) or any("created_at" not in doc for doc in docs):
+                # Some were no longer active; only count and announce the ones this update moved
+                docs = await signals_collection.find(
+                    {"user_id": user_id, "signal_id": {"$in": signal_ids}, "status": new_status, "updated_at": now},
+                    DAILY_BUCKET_FIELDS
+                ).to_list(length=None)
+                signal_ids = [doc["signal_id"] for doc in docs]
+            daily = {}
+            for doc in docs:
+                bucket = daily.setdefault(daily_bucket_key(doc), {"status.active": 0, f"status.{new_status}": 0})
+                bucket["status.active"] -= 1
+                bucket[f"status.{new_status}"] += 1
+            await inc_daily_buckets(daily)
+            for signal_id in signal_ids:
+                await push_broker.publish(user_id, "signal.status", {
+                    "signal_id": signal_id, "status": new_status, "previous_status": "active",
+                    "updated_at": now.isoformat()
+                })
+        changed += result.modified_count
+    return changed
+
+# Conditional GET: the rollup's `version` is bumped on every write to a user's
+# signals or subscription, so it identifies the state behind their list views
+async def bump_data_version(user_id: str):
+    await performance_collection.update_one({"user_id": user_id}, {"$inc": {"version": 1}}, upsert=True)
+
+async def data_version_etag(request: Request, user_id: str) -> str:
+    rollup = await performance_collection.find_one({"user_id": user_id}, {"_id": 0, "version": 1})
+    return rollup_etag(request, user_id, rollup)
+
+# Changes whenever a conditionally served payload changes shape (or the deploy sets BUILD_ID),
+# so a client never replays a cached body from before a release
+RESPONSE_SCHEMA_TAG = hashlib.blake2b(orjson.dumps([
+    SignalListResponse.model_json_schema(), DashboardResponse.model_json_schema(), BUILD_ID
+], option=orjson.OPT_SORT_KEYS), digest_size=6).hexdigest()
+
+def rollup_etag(request: Request, user_id: str, rollup: Optional[dict], state: str = "") -> str:
+    """Weak ETag from the rollup version; `state` adds inputs no write bumps it for"""
+    # Scope to user, URL, response schema and state so a shared device or a release never reuses a stale match
+    scope = hashlib.blake2b(
+        f"{user_id}:{request.url.path}?{request.url.query}:{RESPONSE_SCHEMA_TAG}:{state}".encode(), digest_size=6
+    )
+    return f'W/"{(rollup or {}).get("version", 0)}-{scope.hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+def performance_summary(rollup: Optional[dict]) -> dict:
+    rollup = rollup or {}
+    total = rollup.get("total_signals", 0)
+    counts = rollup.get("status", {})
+    hit_tp = counts.get("hit_tp", 0)
+    stopped = counts.get("stopped_out", 0)
+    completed = hit_tp + stopped
+    return {
+        "total_signals": total,
+        "win_rate": round((hit_tp / completed * 100) if completed > 0 else 0, 1),
+        "active_signals": counts.get("active", 0),
+        "hit_tp": hit_tp,
+        "stopped_out": stopped,
+        "avg_confidence": round(rollup.get("confidence_sum", 0) / total, 1) if total > 0 else 0
+    }
+
+# Background expiry sweeper
+class ExpirySweeper:
+    """Periodically flips active signals past expires_at to expired, in bounded batches"""
+
+    def __init__(self, interval: float, batch_size: int, max_batches: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._task = None
+        self.sweeps = 0
+        self.total_expired = 0
+        self.last_expired = 0
+        self.last_duration_ms = 0.0
+        self.last_error = None
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = repr(e)
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self) -> int:
+        """Expire overdue signals; returns how many changed status"""
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        expired = 0
+        for _ in range(self.max_batches):
+            batch = await signals_collection.find(
+                {"status": "active", "expires_at": {"$lte": now}},
+                DAILY_BUCKET_FIELDS
+            ).limit(self.batch_size).to_list(length=self.batch_size)
+            if not batch:
+                break
+            expired += await resolve_active_signals(batch, "expired", now)
+            outcome_tracker.untrack(doc["signal_id"] for doc in batch)
+            if len(batch) < self.batch_size:
+                break
+            await asyncio.sleep(0)  # yield to request handlers between batches
+
+        self.sweeps += 1
+        self.last_expired = expired
+        self.total_expired += expired
+        self.last_duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        return expired
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "sweeps": self.sweeps,
+            "last_expired": self.last_expired,
+            "total_expired": self.total_expired,
+            "last_duration_ms": self.last_duration_ms,
+            "last_error": self.last_error
+        }
+
+expiry_sweeper = ExpirySweeper(EXPIRY_SWEEP_INTERVAL_SECONDS, EXPIRY_SWEEP_BATCH_SIZE, EXPIRY_SWEEP_MAX_BATCHES)
+
+class FallbackPool:
+    """Latest real model analysis per asset/timeframe, reused when the model can't be reached.
+
+    Every analysis this worker gets is recorded as it arrives; a background
+    refresh reads only signals created since its last pass, so analyses made
+    by other workers arrive too. pick() is a dict lookup: the failure path
+    never touches the database. Only catalogue asset/timeframes are kept and
+    each refresh drops entries past max_age, so the pool stays bounded.
+    """
+
+    ANALYSIS_PROJECTION = {
+        "_id": 0, "asset": 1, "timeframe": 1, "signal": 1, "entry": 1, "take_profit": 1,
+        "stop_loss": 1, "confidence": 1, "ai_reasoning": 1, "risk_reward": 1, "created_at": 1, "signal_id": 1
+    }
+    # Each pass re-reads this far behind the previous one, so signals another
+    # worker committed late with an earlier created_at are still picked up;
+    # re-recording one is a no-op
+    REFRESH_OVERLAP = timedelta(seconds=30)
+
+    def __init__(self, interval: float, max_age: float, batch_size: int):
+        self.interval = interval
+        self.max_age = timedelta(seconds=max_age)
+        self.batch_size = batch_size
+        self._entries = {}  # (asset, timeframe) -> (created_at, analysis)
+        self._watermark = None
+        self._task = None
+        self.refreshes = 0
+        self.last_loaded = 0
+        self.served = 0
+        self.misses = 0
+        self.last_error = None
+
+    def record(self, asset: str, timeframe: str, signal_data: dict, created_at: datetime):
+        if (asset, timeframe) not in CATALOGUE_KEYS:
+            return
+        current = self._entries.get((asset, timeframe))
+        if current is None or current[0] <= created_at:
+            self._entries[(asset, timeframe)] = (created_at, signal_data)
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Drop entries pick() would no longer serve"""
+        cutoff = (now or datetime.now(timezone.utc)) - self.max_age
+        stale = [key for key, (created_at, _) in self._entries.items() if created_at < cutoff]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def pick(self, asset: str, timeframe: str) -> Optional[dict]:
+        """Analysis for exactly this asset/timeframe, if recent enough.
+
+        Never another timeframe's: its levels are sized for a different horizon
+        than the expiry the fallback signal gets.
+        """
+        entry = self._entries.get((asset, timeframe))
+        if entry is None or datetime.now(timezone.utc) - entry[0] > self.max_age:
+            self.misses += 1
+            return None
+        self.served += 1
+        return entry[1]
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = repr(e)
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self) -> int:
+        """Load model signals created since the previous refresh (or within max_age on the first)"""
+        if self._watermark is None:
+            since = datetime.now(timezone.utc) - self.max_age
         else:
-            raise ValueError("No JSON found in response")
-        
-        signal_id = str(uuid.uuid4())
-        created_at = datetime.now(timezone.utc)
-        expires_at = created_at + timedelta(hours=24 if request.timeframe == "Swing" else 8 if request.timeframe == "Intraday" else 2)
-        
-        signal_doc = {
-            "signal_id": signal_id,
-            "user_id": user["user_id"],
-            "asset": request.asset,
-            "signal": signal_data.get("signal", "BUY"),
-            "entry": float(signal_data.get("entry", 0)),
-            "take_profit": [float(tp) for tp in signal_data.get("take_profit", [])],
-            "stop_loss": float(signal_data.get("stop_loss", 0)) if signal_data.get("stop_loss") else None,
-            "confidence": int(signal_data.get("confidence", 75)),
-            "timeframe": request.timeframe,
-            "status": "active",
-            "ai_reasoning": signal_data.get("reasoning", ""),
-            "risk_reward": signal_data.get("risk_reward", "1:2"),
-            "created_at": created_at.isoformat(),
-            "expires_at": expires_at.isoformat()
+            since = self._watermark - self.REFRESH_OVERLAP
+        # Pages are keyed on (created_at, signal_id) so signals sharing a
+        # created_at across a page boundary are not skipped
+        cursor = {"created_at": {"$gte": since}}
+        watermark = self._watermark or since
+        loaded = 0
+        while True:
+            batch = await signals_collection.find(
+                {**cursor, "source": {"$ne": "fallback"}},
+                self.ANALYSIS_PROJECTION
+            ).sort([("created_at", 1), ("signal_id", 1)]).limit(self.batch_size).to_list(length=self.batch_size)
+            for doc in batch:
+                since = as_utc_datetime(doc["created_at"])
+                watermark = max(watermark, since)
+                self.record(doc["asset"], doc["timeframe"], {
+                    "signal": doc["signal"],
+                    "entry": doc["entry"],
+                    "take_profit": doc["take_profit"],
+                    "stop_loss": doc.get("stop_loss"),
+                    "confidence": doc["confidence"],
+                    "reasoning": doc.get("ai_reasoning", ""),
+                    "risk_reward": doc.get("risk_reward", "1:2")
+                }, since)
+            loaded += len(batch)
+            if len(batch) < self.batch_size:
+                break
+            cursor = {"$or": [
+                {"created_at": {"$gt": since}},
+                {"created_at": since, "signal_id": {"$gt": batch[-1]["signal_id"]}}
+            ]}
+            await asyncio.sleep(0)
+        self._watermark = watermark
+        self.prune()
+        self.refreshes += 1
+        self.last_loaded = loaded
+        return loaded
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "entries": len(self._entries),
+            "refreshes": self.refreshes,
+            "last_loaded": self.last_loaded,
+            "served": self.served,
+            "misses": self.misses,
+            "last_error": self.last_error
         }
-        
-        signals_collection.insert_one(signal_doc)
-        
-        return SignalResponse(
-            id=signal_id,
-            asset=signal_doc["asset"],
-            signal=signal_doc["signal"],
-            entry=signal_doc["entry"],
-            take_profit=signal_doc["take_profit"],
-            stop_loss=signal_doc["stop_loss"],
-            confidence=signal_doc["confidence"],
-            timeframe=signal_doc["timeframe"],
-            status=signal_doc["status"],
-            ai_reasoning=signal_doc["ai_reasoning"],
-            risk_reward=signal_doc["risk_reward"],
-            created_at=signal_doc["created_at"],
-            expires_at=signal_doc["expires_at"]
+
+fallback_pool = FallbackPool(FALLBACK_REFRESH_INTERVAL_SECONDS, FALLBACK_MAX_AGE_SECONDS, FALLBACK_REFRESH_BATCH_SIZE)
+
+# Outcome tracking against a local price feed
+async def csv_tick_source(path: str, rate: float = 0):
+    """Replay (asset, price) ticks from a CSV file with asset and price columns"""
+    with open(path, newline="") as f:
+        for index, row in enumerate(csv.DictReader(f)):
+            yield row["asset"], float(row["price"])
+            if rate > 0:
+                await asyncio.sleep(1 / rate)
+            elif index % 1000 == 0:
+                await asyncio.sleep(0)
+
+class OutcomeTracker:
+    """Resolves active signals to hit_tp/stopped_out as price ticks arrive"""
+
+    def __init__(self, source_path: Optional[str], replay_rate: float, flush_interval: float, flush_size: int):
+        self.source_path = source_path
+        self.replay_rate = replay_rate
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.resolver = OutcomeResolver()
+        self._owners = {}
+        self._pending = {HIT_TP: [], STOPPED_OUT: []}
+        self._task = None
+        self.ticks = 0
+        self.resolved = 0
+        self.last_error = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.source_path)
+
+    def track(self, signal_doc: dict):
+        if not self.enabled or signal_doc.get("status", "active") != "active":
+            return
+        if signal_doc["signal_id"] in self.resolver:
+            return
+        take_profit = signal_doc.get("take_profit") or [None]
+        self.resolver.add(
+            signal_doc["signal_id"], signal_doc["asset"], signal_doc.get("signal", "BUY"),
+            take_profit[0], signal_doc.get("stop_loss")
         )
-        
-    except Exception as e:
-        # Fallback demo signal if AI fails
-        signal_id = str(uuid.uuid4())
-        created_at = datetime.now(timezone.utc)
-        expires_at = created_at + timedelta(hours=8)
-        
-        demo_signal = {
-            "signal_id": signal_id,
-            "user_id": user["user_id"],
-            "asset": request.asset,
-            "signal": "BUY",
-            "entry": 42350.0 if "BTC" in request.asset else 2850.0,
-            "take_profit": [43500.0, 44200.0] if "BTC" in request.asset else [2950.0, 3050.0],
-            "stop_loss": 41700.0 if "BTC" in request.asset else 2750.0,
-            "confidence": 78,
-            "timeframe": request.timeframe,
-            "status": "active",
-            "ai_reasoning": f"Technical analysis indicates bullish momentum for {request.asset}. RSI showing oversold conditions with MACD crossover confirmation.",
-            "risk_reward": "1:2.5",
-            "created_at": created_at.isoformat(),
-            "expires_at": expires_at.isoformat()
+        if signal_doc["signal_id"] in self.resolver:
+            self._owners[signal_doc["signal_id"]] = signal_doc["user_id"]
+
+    def untrack(self, signal_ids):
+        if not self.enabled:
+            return
+        for signal_id in signal_ids:
+            self.resolver.discard(signal_id)
+            self._owners.pop(signal_id, None)
+
+    async def start(self):
+        if not self.enabled or self._task is not None:
+            return
+        async for doc in signals_collection.find(
+            {"status": "active"},
+            {"_id": 0, "signal_id": 1, "user_id": 1, "asset": 1, "signal": 1, "take_profit": 1, "stop_loss": 1}
+        ).batch_size(1000):
+            self.track(doc)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        try:
+            last_flush = time.monotonic()
+            async for asset, price in csv_tick_source(self.source_path, self.replay_rate):
+                self.ticks += 1
+                for signal_id, outcome in self.resolver.on_tick(asset, price):
+                    self._pending[outcome].append({"signal_id": signal_id, "user_id": self._owners.pop(signal_id)})
+                pending = len(self._pending[HIT_TP]) + len(self._pending[STOPPED_OUT])
+                if pending >= self.flush_size or (pending and time.monotonic() - last_flush >= self.flush_interval):
+                    await self.flush()
+                    last_flush = time.monotonic()
+            await self.flush()
+        except Exception as e:
+            self.last_error = repr(e)
+
+    async def flush(self):
+        """Write buffered outcomes as bulk status updates"""
+        for outcome, matches in self._pending.items():
+            if matches:
+                self._pending[outcome] = []
+                self.resolved += await resolve_active_signals(matches, outcome)
+        self.resolver.compact()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "open_signals": len(self.resolver),
+            "ticks": self.ticks,
+            "resolved": self.resolved,
+            "last_error": self.last_error
         }
-        signals_collection.insert_one(demo_signal)
-        
-        return SignalResponse(
-            id=signal_id,
-            asset=demo_signal["asset"],
-            signal=demo_signal["signal"],
-            entry=demo_signal["entry"],
-            take_profit=demo_signal["take_profit"],
-            stop_loss=demo_signal["stop_loss"],
-            confidence=demo_signal["confidence"],
-            timeframe=demo_signal["timeframe"],
-            status=demo_signal["status"],
-            ai_reasoning=demo_signal["ai_reasoning"],
-            risk_reward=demo_signal["risk_reward"],
-            created_at=demo_signal["created_at"],
-            expires_at=demo_signal["expires_at"]
+
+outcome_tracker = OutcomeTracker(
+    PRICE_FEED_REPLAY_FILE, PRICE_FEED_REPLAY_RATE,
+    OUTCOME_FLUSH_INTERVAL_SECONDS, OUTCOME_FLUSH_SIZE
+)
+
+# Real-time push
+push_hub = PushHub(PUSH_QUEUE_SIZE)
+if PUSH_BROKER == "mongo":
+    push_broker = MongoBroker(push_hub, db, "push_events", PUSH_EVENTS_CAPPED_BYTES)
+else:
+    push_broker = LocalBroker(push_hub)
+PUSH_CONNECTIONS.set_function(lambda: push_hub.connections)
+
+# Plan rate limits
+RATE_LIMITS = {
+    "generate": {
+        "minute": parse_plan_limits(RATE_LIMIT_GENERATE, RateLimit.per_minute),
+        "day": parse_plan_limits(GENERATION_DAILY_QUOTA, RateLimit.per_day)
+    }
+}
+if RATE_LIMIT_BACKEND == "mongo":
+    rate_limiter = MongoRateLimiter(db["rate_limits"])
+else:
+    rate_limiter = LocalRateLimiter(RATE_LIMIT_MAX_KEYS)
+
+async def refund_rate_limit(spent: list, cost: int = 1):
+    """Give cost back to every (key, limit) bucket enforce_rate_limit spent from"""
+    for key, limit in spent:
+        await rate_limiter.refund(key, limit, cost)
+
+async def enforce_rate_limit(route: str, user_id: str, plan: str, cost: int = 1) -> list:
+    """Spend cost from the user's buckets for route; 429 with Retry-After when one is empty.
+
+    Tokens already taken from earlier windows are refunded on rejection, so a
+    request refused by the daily quota doesn't also drain the minute bucket.
+    Returns the (key, limit) buckets spent from, for refund_rate_limit when the
+    request then produces no signal.
+    """
+    spent = []
+    for window, plan_limits in RATE_LIMITS[route].items():
+        limit = limit_for_plan(plan_limits, plan)
+        if limit is None:
+            continue
+        key = f"{route}:{window}:{user_id}"
+        retry_after = await rate_limiter.hit(key, limit, cost)
+        if not retry_after:
+            spent.append((key, limit))
+            continue
+        await refund_rate_limit(spent, cost)
+        RATE_LIMITED_REQUESTS.labels(route, plan, window).inc()
+        if math.isinf(retry_after):
+            raise HTTPException(status_code=429, detail=f"Request exceeds the {plan} plan's {window} limit")
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded for {route} ({window})",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
         )
+    return spent
+
+class IdempotencyStore:
+    """Runs a write at most once per (user, Idempotency-Key) and replays its response.
+
+    The key, a hash of the request and the serialized response live in a TTL-indexed
+    collection. A duplicate arriving while the original runs in this worker
+    awaits the same task; one handled by another worker polls until the
+    original's response is stored. A pending claim older than claim_timeout
+    is treated as abandoned (its worker died) and taken over.
+    """
+
+    POLL_SECONDS = 0.1
+
+    def __init__(self, collection, wait_seconds: float, claim_timeout: float):
+        self.collection = collection
+        self.wait_seconds = wait_seconds
+        self.claim_timeout = claim_timeout
+        self.flight = SingleFlight()
+        self.executed = 0
+        self.replayed = 0
+        self.coalesced = 0
+        self.conflicts = 0
+        self.mismatched = 0
+
+    @staticmethod
+    def fingerprint(route: str, payload: dict) -> str:
+        raw = orjson.dumps([route, payload], option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    async def run(self, route: str, user_id: str, key: str, fingerprint: str, handler):
+        """Return (JSON bytes, replayed) of the first request with this key, running handler only once"""
+        doc_id = f"{user_id}:{key}"
+        flight_key = (doc_id, fingerprint)
+        if self.flight.pending(flight_key):
+            self.coalesced += 1
+            IDEMPOTENCY_REQUESTS.labels(route, "coalesced").inc()
+            content, _ = await self.flight.run(flight_key, None)
+            return content, True
+        return await self.flight.run(flight_key, lambda: self._claim(route, doc_id, fingerprint, handler))
+
+    async def _claim(self, route: str, doc_id: str, fingerprint: str, handler):
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                await self.collection.insert_one({
+                    "_id": doc_id, "request_hash": fingerprint, "state": "pending",
+                    "created_at": datetime.now(timezone.utc)
+                })
+                break
+            except DuplicateKeyError:
+                pass
+            existing = await self.collection.find_one({"_id": doc_id})
+            if existing is None:
+                continue  # the original failed and released its claim; take it
+            if existing["request_hash"] != fingerprint:
+                self.mismatched += 1
+                IDEMPOTENCY_REQUESTS.labels(route, "mismatch").inc()
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+            if existing["state"] == "done":
+                self.replayed += 1
+                IDEMPOTENCY_REQUESTS.labels(route, "replayed").inc()
+                return bytes(existing["body"]), True
+            claimed_at = as_utc_datetime(existing["created_at"])
+            if datetime.now(timezone.utc) - claimed_at > timedelta(seconds=self.claim_timeout):
+                await self.collection.delete_one({"_id": doc_id, "state": "pending", "created_at": existing["created_at"]})
+                continue
+            if time.monotonic() >= deadline:
+                self.conflicts += 1
+                IDEMPOTENCY_REQUESTS.labels(route, "conflict").inc()
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            await asyncio.sleep(self.POLL_SECONDS)
+
+        try:
+            content = orjson.dumps(await handler())
+        except BaseException:
+            # Nothing was committed for this key; let a retry run the request again
+            await self.collection.delete_one({"_id": doc_id, "state": "pending"})
+            raise
+        # Stored as bytes so replays match the original byte for byte (BSON dates drop microseconds)
+        await self.collection.update_one({"_id": doc_id}, {"$set": {"state": "done", "body": content}})
+        self.executed += 1
+        IDEMPOTENCY_REQUESTS.labels(route, "executed").inc()
+        return content, False
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "coalesced": self.coalesced,
+            "duplicates_avoided": self.replayed + self.coalesced,
+            "conflicts": self.conflicts,
+            "mismatched": self.mismatched
+        }
+
+idempotency_store = IdempotencyStore(
+    idempotency_collection, IDEMPOTENCY_WAIT_SECONDS, IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS
+)
+
+async def idempotent_response(route: str, user_id: str, key: Optional[str], payload: dict, handler) -> Response:
+    """Run handler, or replay its stored response when the Idempotency-Key was seen before"""
+    if not key:
+        return ORJSONResponse(await handler())
+    if len(key) > 255:
+        raise HTTPException(status_code=400, detail="Idempotency-Key must be at most 255 characters")
+    fingerprint = IdempotencyStore.fingerprint(route, payload)
+    content, replayed = await idempotency_store.run(route, user_id, key, fingerprint, handler)
+    headers = {"Idempotency-Key": key}
+    if replayed:
+        headers["Idempotent-Replayed"] = "true"
+    return Response(content=content, media_type="application/json", headers=headers)
+
+# Signal list pagination
+def encode_signal_cursor(signal_doc: dict) -> str:
+    raw = json.dumps([to_iso(signal_doc["created_at"]), signal_doc["signal_id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_signal_cursor(cursor: str) -> dict:
+    """Turn an opaque cursor into the keyset condition for the next page"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, signal_id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = as_utc_datetime(created_at)
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "signal_id": {"$lt": signal_id}}
+    ]}
+
+def signal_list_projection(fields: Optional[str], compact: bool) -> dict:
+    if fields:
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested - set(SIGNAL_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        # The cursor needs both sort keys
+        projection = {f: 1 for f in requested | {"created_at", "signal_id"}}
+        projection["_id"] = 0
+        return projection
+    if compact:
+        return {"_id": 0, "ai_reasoning": 0}
+    return {"_id": 0}
+
+# Signal history export
+EXPORT_CSV_FIELDS = (
+    "signal_id", "asset", "signal", "entry", "take_profit", "stop_loss", "confidence", "timeframe",
+    "status", "source", "risk_reward", "created_at", "expires_at", "updated_at", "ai_reasoning"
+)
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
-@app.get("/api/signals")
-async def get_signals(user: dict = Depends(get_current_user), limit: int = 20):
-    """Get user's trading signals"""
-    subscription = check_subscription(user["user_id"])
+def csv_export_row(doc: dict) -> list:
+    row = []
+    for field in EXPORT_CSV_FIELDS:
+        value = doc.get(field)
+        if isinstance(value, datetime):
+            value = to_iso(value)
+        elif isinstance(value, list):
+            value = ";".join(str(item) for item in value)
+        row.append(value)
+    return row
+
+async def export_chunks(cursor, export_format: str, compress: bool):
+    """Encode cursor documents as NDJSON or CSV, yielding ~EXPORT_CHUNK_BYTES at a time.
+
+    Only the current cursor batch and one output chunk are held in memory.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31 = gzip framing
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_CSV_FIELDS)
+        async for doc in cursor:
+            writer.writerow(csv_export_row(doc))
+            if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                chunk = emit(buffer.getvalue().encode())
+                buffer.seek(0)
+                buffer.truncate()
+                if chunk:
+                    yield chunk
+        tail = buffer.getvalue().encode()
+    else:
+        parts, size = [], 0
+        async for doc in cursor:
+            line = orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE)
+            parts.append(line)
+            size += len(line)
+            if size >= EXPORT_CHUNK_BYTES:
+                chunk = emit(b"".join(parts))
+                parts, size = [], 0
+                if chunk:
+                    yield chunk
+        tail = b"".join(parts)
+    tail = emit(tail) + compressor.flush() if compressor else tail
+    if tail:
+        yield tail
+
+# Signal endpoints
+@app.post("/api/signals/generate", response_model=SignalResponse)
+async def generate_signal(
+    request: SignalRequest,
+    user: dict = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """Generate AI trading signal using GPT-5.2.
+
+    Retries carrying the same Idempotency-Key return the first signal instead
+    of generating (and storing) another one.
+    """
+    return await idempotent_response(
+        "generate", user["user_id"], idempotency_key, request.model_dump(),
+        lambda: create_signal(user, request)
+    )
+
+async def create_signal(user: dict, request: SignalRequest) -> dict:
+    subscription = await check_subscription(user["user_id"])
     if not subscription.get("is_active"):
         raise HTTPException(status_code=403, detail="Active subscription required")
+    spent = await enforce_rate_limit("generate", user["user_id"], subscription.get("plan", ""))
     
-    signals = list(signals_collection.find(
-        {"user_id": user["user_id"]},
-        {"_id": 0}
-    ).sort("created_at", -1).limit(limit))
+    started = time.perf_counter()
+    try:
+        signal_data = await get_signal_analysis(request.asset, request.timeframe)
+        signal_doc = build_signal_doc(user["user_id"], request, signal_data)
+        outcome = "success"
+    except Exception as e:
+        # Reuse a recent real analysis of this asset if the AI call fails
+        signal_doc = build_fallback_signal_doc(user["user_id"], request)
+        outcome = "fallback" if signal_doc is not None else "unavailable"
+    SIGNAL_ANALYSIS_SECONDS.labels(outcome).observe(time.perf_counter() - started)
+    if signal_doc is None:
+        await refund_rate_limit(spent)
+        raise analysis_unavailable(request.asset)
     
-    return {"signals": signals, "count": len(signals)}
+    await store_signals([signal_doc])
+    return signal_payload(signal_doc)
+
+@app.post("/api/signals/generate/stream")
+async def generate_signal_stream(request: SignalRequest, user: dict = Depends(get_current_user)):
+    """Generate an AI trading signal, streaming model output as Server-Sent Events.
+
+    Emits `start`, then `chunk` events with raw model text, then a terminal
+    `signal` event carrying the stored SignalResponse (or `error` when neither
+    the model nor the fallback pool has an analysis).
+    """
+    subscription = await check_subscription(user["user_id"])
+    if not subscription.get("is_active"):
+        raise HTTPException(status_code=403, detail="Active subscription required")
+    spent = await enforce_rate_limit("generate", user["user_id"], subscription.get("plan", ""))
+
+    async def events():
+        yield sse_event("start", {"asset": request.asset, "timeframe": request.timeframe})
+
+        chunks = asyncio.Queue()
+        started = time.perf_counter()
+        signal_data = signal_analysis_cache.get((request.asset, request.timeframe))
+        task = None
+        if signal_data is None:
+            task = asyncio.create_task(
+                stream_shared_signal_analysis(request.asset, request.timeframe, chunks.put_nowait)
+            )
+            task.add_done_callback(lambda _: chunks.put_nowait(None))
+        try:
+            if task is not None:
+                while (chunk := await chunks.get()) is not None:
+                    yield sse_event("chunk", {"text": chunk})
+            try:
+                if task is not None:
+                    signal_data = task.result()
+                signal_doc = build_signal_doc(user["user_id"], request, signal_data)
+                outcome = "success"
+            except Exception:
+                signal_doc = build_fallback_signal_doc(user["user_id"], request)
+                outcome = "fallback" if signal_doc is not None else "unavailable"
+            SIGNAL_ANALYSIS_SECONDS.labels(outcome).observe(time.perf_counter() - started)
+            if signal_doc is None:
+                await refund_rate_limit(spent)
+                yield sse_event("error", {"detail": analysis_unavailable(request.asset).detail})
+                return
 
-@app.get("/api/signals/{signal_id}")
+            await store_signals([signal_doc])
+            yield sse_event("signal", signal_payload(signal_doc))
+        finally:
+            if task is not None and not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/signals/generate/batch", response_model=SignalBatchResponse)
+async def generate_signal_batch(batch: SignalBatchRequest, user: dict = Depends(get_current_user)):
+    """Generate signals for several asset/timeframe pairs in one request.
+
+    Analyses fan out concurrently (sharing in-flight and cached model calls),
+    all resulting documents are written with one insert_many, and items whose
+    analysis failed are reported individually instead of getting a demo signal.
+    """
+    subscription = await check_subscription(user["user_id"])
+    if not subscription.get("is_active"):
+        raise HTTPException(status_code=403, detail="Active subscription required")
+    spent = await enforce_rate_limit("generate", user["user_id"], subscription.get("plan", ""), cost=len(batch.items))
+
+    limit = asyncio.Semaphore(SIGNAL_BATCH_CONCURRENCY)
+
+    async def analyse(item: SignalRequest):
+        async with limit:
+            started = time.perf_counter()
+            try:
+                signal_data = await get_signal_analysis(item.asset, item.timeframe)
+                doc, error = build_signal_doc(user["user_id"], item, signal_data), None
+            except LlmUnavailable as e:
+                doc, error = None, f"AI provider unavailable: {e}"
+            except Exception:
+                doc, error = None, "Signal analysis failed"
+            SIGNAL_ANALYSIS_SECONDS.labels("success" if error is None else "error").observe(
+                time.perf_counter() - started
+            )
+            return doc, error
+
+    outcomes = await asyncio.gather(*(analyse(item) for item in batch.items))
+
+    signal_docs = [doc for doc, _ in outcomes if doc is not None]
+    if signal_docs:
+        await store_signals(signal_docs)
+    if len(signal_docs) < len(batch.items):
+        # Failed items don't count against the quota
+        await refund_rate_limit(spent, len(batch.items) - len(signal_docs))
+
+    results = [
+        {
+            "asset": item.asset,
+            "timeframe": item.timeframe,
+            "signal": signal_payload(doc) if doc is not None else None,
+            "error": error
+        }
+        for item, (doc, error) in zip(batch.items, outcomes)
+    ]
+    return ORJSONResponse({
+        "results": results,
+        "succeeded": len(signal_docs),
+        "failed": len(results) - len(signal_docs)
+    })
+
+@app.get("/api/signals", response_model=SignalListResponse)
+async def get_signals(
+    request: Request,
+    user: dict = Depends(get_current_user),
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    asset: Optional[str] = None,
+    fields: Optional[str] = None,
+    compact: bool = False
+):
+    """Get user's trading signals, newest first.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    `compact=true` drops ai_reasoning; `fields=a,b` returns only those fields.
+    Send the returned ETag as If-None-Match to get 304 while nothing changed.
+    """
+    subscription = await check_subscription(user["user_id"])
+    if not subscription.get("is_active"):
+        raise HTTPException(status_code=403, detail="Active subscription required")
+    
+    etag = await data_version_etag(request, user["user_id"])
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+    
+    limit = max(1, min(limit, SIGNALS_MAX_PAGE_SIZE))
+    query = {"user_id": user["user_id"]}
+    if status:
+        query["status"] = status
+    if asset:
+        query["asset"] = asset
+    if cursor:
+        query.update(decode_signal_cursor(cursor))
+    
+    # Fetch one extra document to learn whether another page exists
+    signals = await signals_collection.find(
+        query,
+        signal_list_projection(fields, compact)
+    ).sort([("created_at", -1), ("signal_id", -1)]).limit(limit + 1).to_list(length=limit + 1)
+    
+    next_cursor = None
+    if len(signals) > limit:
+        signals = signals[:limit]
+        next_cursor = encode_signal_cursor(signals[-1])
+    
+    return ORJSONResponse(
+        {"signals": signals, "count": len(signals), "next_cursor": next_cursor},
+        headers={"ETag": etag, "Cache-Control": PRIVATE_REVALIDATE}
+    )
+
+@app.get("/api/signals/export")
+async def export_signals(
+    user: dict = Depends(get_current_user),
+    format: str = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    status: Optional[str] = None,
+    asset: Optional[str] = None,
+    gzip: bool = False
+):
+    """Stream the user's full signal history, oldest first, as NDJSON or CSV.
+
+    `since`/`until` bound created_at (inclusive/exclusive); `gzip=true`
+    compresses the stream. Documents are read from the cursor in batches of
+    EXPORT_BATCH_SIZE, so memory stays flat however long the history is.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}")
+    subscription = await check_subscription(user["user_id"])
+    if not subscription.get("is_active"):
+        raise HTTPException(status_code=403, detail="Active subscription required")
+    query = {"user_id": user["user_id"]}
+    if since or until:
+        query["created_at"] = {}
+        if since:
+            query["created_at"]["$gte"] = as_utc_datetime(since)
+        if until:
+            query["created_at"]["$lt"] = as_utc_datetime(until)
+    if status:
+        query["status"] = status
+    if asset:
+        query["asset"] = asset
+
+    cursor = signals_collection.find(query, {"_id": 0, "user_id": 0}).sort(
+        [("created_at", 1), ("signal_id", 1)]
+    ).batch_size(EXPORT_BATCH_SIZE)
+    filename = f"signals-{datetime.now(timezone.utc):%Y%m%d}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_chunks(cursor, format, gzip),
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"}
+    )
+
+@app.get("/api/signals/{signal_id}", response_model=StoredSignal)
 async def get_signal(signal_id: str, user: dict = Depends(get_current_user)):
     """Get specific signal details"""
-    signal = signals_collection.find_one(
+    signal = await signals_collection.find_one(
         {"signal_id": signal_id, "user_id": user["user_id"]},
         {"_id": 0}
     )
     if not signal:
         raise HTTPException(status_code=404, detail="Signal not found")
-    return signal
+    return ORJSONResponse(signal)
 
 @app.patch("/api/signals/{signal_id}/status")
 async def update_signal_status(signal_id: str, status: str, user: dict = Depends(get_current_user)):
     """Update signal status (active, hit_tp, stopped_out, expired)"""
-    result = signals_collection.update_one(
+    if status not in SIGNAL_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Status must be one of: {', '.join(SIGNAL_STATUSES)}")
+    updated_at = datetime.now(timezone.utc)
+    previous = await signals_collection.find_one_and_update(
         {"signal_id": signal_id, "user_id": user["user_id"]},
-        {"$set": {"status": status, "updated_at": datetime.now(timezone.utc).isoformat()}}
+        {"$set": {"status": status, "updated_at": updated_at}},
+        projection={"_id": 0, "signal_id": 1, "user_id": 1, "asset": 1, "signal": 1, "timeframe": 1,
+                    "take_profit": 1, "stop_loss": 1, "status": 1, "created_at": 1}
     )
-    if result.modified_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Signal not found")
+    await move_status_rollup(previous, status)
+    if status == "active":
+        outcome_tracker.track({**previous, "status": "active"})
+    else:
+        outcome_tracker.untrack([signal_id])
+    if previous.get("status", "active") != status:
+        await push_broker.publish(user["user_id"], "signal.status", {
+            "signal_id": signal_id, "status": status,
+            "previous_status": previous.get("status", "active"), "updated_at": updated_at.isoformat()
+        })
     return {"success": True, "status": status}
 
+# Real-time push
+@app.websocket("/api/ws")
+async def push_socket(websocket: WebSocket):
+    """Push signal.created, signal.status and subscription.updated events to the user's sessions.
+
+    Authenticate with an `Authorization: Bearer <access token>` handshake header
+    (never the query string, which servers and proxies log). A session whose
+    send queue overflows is closed with code 1013; clients should reconnect and refetch.
+    """
+    scheme, _, token = websocket.headers.get("authorization", "").partition(" ")
+    try:
+        if scheme.lower() != "bearer" or not token:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        user = await authenticate_token(token.strip())
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    connection = push_hub.connect(user["user_id"])
+
+    async def forward():
+        try:
+            await push_hub.pump(connection, websocket.send_text)
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except Exception:
+            pass  # client went away; the receive loop sees the disconnect
+
+    sender = asyncio.create_task(forward())
+    try:
+        # Clients only listen; keep reading so disconnects are noticed promptly
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        push_hub.disconnect(connection)
+
 # Performance endpoints
-@app.get("/api/performance")
+@app.get("/api/performance", response_model=PerformanceResponse)
 async def get_performance(user: dict = Depends(get_current_user)):
     """Get trading performance statistics"""
-    signals = list(signals_collection.find(
-        {"user_id": user["user_id"]},
-        {"_id": 0}
-    ))
+    rollup = await performance_collection.find_one({"user_id": user["user_id"]}, {"_id": 0})
+    return ORJSONResponse(performance_summary(rollup))
+
+TIMESERIES_INTERVALS = {"day": 1, "week": 7}
+
+@app.get("/api/performance/timeseries", response_model=PerformanceTimeseriesResponse)
+async def get_performance_timeseries(
+    user: dict = Depends(get_current_user),
+    interval: str = "day",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    asset: Optional[str] = None,
+    timeframe: Optional[str] = None
+):
+    """Win rate, counts and average confidence per UTC day or ISO week.
+
+    Read from the performance_daily buckets inside the window only. Signals
+    count in the bucket of the day they were created; `since`/`until` are
+    widened to whole buckets and default to the last
+    PERFORMANCE_TIMESERIES_DEFAULT_DAYS days. Empty buckets are included.
+    """
+    if interval not in TIMESERIES_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of: {', '.join(TIMESERIES_INTERVALS)}")
+    step = timedelta(days=TIMESERIES_INTERVALS[interval])
+
+    def bucket_start(day: datetime) -> datetime:
+        day = utc_day(day)
+        return day - timedelta(days=day.weekday()) if interval == "week" else day
+
+    end = bucket_start(until - timedelta(microseconds=1)) + step if until else bucket_start(datetime.now(timezone.utc)) + step
+    start = bucket_start(since) if since else bucket_start(end - timedelta(days=PERFORMANCE_TIMESERIES_DEFAULT_DAYS))
+    if start >= end:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    # Widening to whole buckets may add up to one more bucket
+    if end - start > timedelta(days=PERFORMANCE_TIMESERIES_MAX_DAYS) + step:
+        raise HTTPException(status_code=400, detail=f"Window is limited to {PERFORMANCE_TIMESERIES_MAX_DAYS} days")
+
+    query = {"user_id": user["user_id"], "day": {"$gte": start, "$lt": end}}
+    if asset:
+        query["asset"] = asset
+    if timeframe:
+        query["timeframe"] = timeframe
+
+    def empty() -> dict:
+        return {"total_signals": 0, "confidence_sum": 0, "status": {}}
+
+    buckets = {}
+    totals = empty()
+    async for doc in daily_collection.find(query, {"_id": 0, "day": 1, "total_signals": 1, "confidence_sum": 1, "status": 1}):
+        for rollup in (buckets.setdefault(bucket_start(doc["day"]), empty()), totals):
+            rollup["total_signals"] += doc.get("total_signals", 0)
+            rollup["confidence_sum"] += doc.get("confidence_sum", 0)
+            for status_name, count in doc.get("status", {}).items():
+                rollup["status"][status_name] = rollup["status"].get(status_name, 0) + count
+
+    points = []
+    point = start
+    while point < end:
+        points.append({"start": point, **performance_summary(buckets.get(point))})
+        point += step
+    return ORJSONResponse({
+        "interval": interval, "since": start, "until": end,
+        "points": points, "totals": performance_summary(totals)
+    })
+
+backtest_bars = BarStore(BACKTEST_BARS_DIR) if BACKTEST_BARS_DIR else None
+
+@app.get("/api/performance/backtest")
+async def backtest_performance(
+    user: dict = Depends(get_current_user),
+    group_by: str = "asset,timeframe,confidence",
+    asset: Optional[str] = None
+):
+    """Grade the user's signals against historical bars: hit rate, R multiple, time to outcome"""
+    if backtest_bars is None:
+        raise HTTPException(status_code=503, detail="Backtest data not configured")
+    fields = [f.strip() for f in group_by.split(",") if f.strip()]
+    unknown = set(fields) - set(GROUP_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown group_by fields: {', '.join(sorted(unknown))}")
     
-    total = len(signals)
-    if total == 0:
-        return {
-            "total_signals": 0,
-            "win_rate": 0,
-            "active_signals": 0,
-            "hit_tp": 0,
-            "stopped_out": 0,
-            "avg_confidence": 0
-        }
+    query = {"user_id": user["user_id"]}
+    if asset:
+        query["asset"] = asset
+    signal_docs = await signals_collection.find(
+        query,
+        {"_id": 0, "asset": 1, "timeframe": 1, "signal": 1, "entry": 1, "take_profit": 1,
+         "stop_loss": 1, "confidence": 1, "created_at": 1, "expires_at": 1}
+    ).to_list(length=None)
+    if not signal_docs:
+        return {"overall": {"signals": 0}, "groups": []}
     
-    active = sum(1 for s in signals if s.get("status") == "active")
-    hit_tp = sum(1 for s in signals if s.get("status") == "hit_tp")
-    stopped = sum(1 for s in signals if s.get("status") == "stopped_out")
-    completed = hit_tp + stopped
+    def grade():
+        columns = signals_to_arrays(signal_docs)
+        return summarize(columns, run_backtest(columns, backtest_bars), fields)
     
-    return {
-        "total_signals": total,
-        "win_rate": round((hit_tp / completed * 100) if completed > 0 else 0, 1),
-        "active_signals": active,
-        "hit_tp": hit_tp,
-        "stopped_out": stopped,
-        "avg_confidence": round(sum(s.get("confidence", 0) for s in signals) / total, 1)
-    }
+    # NumPy work runs off the event loop
+    return await asyncio.to_thread(grade)
 
 # Subscription endpoints (mocked for testing)
 @app.get("/api/subscription")
 async def get_subscription(user: dict = Depends(get_current_user)):
     """Get subscription status (mocked for RevenueCat testing)"""
-    return check_subscription(user["user_id"])
+    return await check_subscription(user["user_id"])
 
 @app.post("/api/subscription/activate")
-async def activate_subscription(data: SubscriptionUpdate, user: dict = Depends(get_current_user)):
-    """Activate/update subscription (mock endpoint for RevenueCat webhook simulation)"""
+async def activate_subscription(
+    data: SubscriptionUpdate,
+    user: dict = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """Activate/update subscription (mock endpoint for RevenueCat webhook simulation).
+
+    Honours Idempotency-Key like signal generation does.
+    """
+    return await idempotent_response(
+        "subscription_activate", user["user_id"], idempotency_key, data.model_dump(mode="json"),
+        lambda: apply_subscription_update(user, data)
+    )
+
+async def apply_subscription_update(user: dict, data: SubscriptionUpdate) -> dict:
     sub_doc = {
         "user_id": user["user_id"],
         "is_active": data.is_active,
         "plan": data.plan,
         "price": 49.99,
-        "expires_at": data.expires_at or (datetime.now(timezone.utc) + timedelta(days=30)).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "expires_at": as_utc_datetime(data.expires_at) if data.expires_at else datetime.now(timezone.utc) + timedelta(days=30),
+        "updated_at": datetime.now(timezone.utc)
     }
-    subscriptions_collection.update_one(
+    await subscriptions_collection.update_one(
         {"user_id": user["user_id"]},
         {"$set": sub_doc},
         upsert=True
     )
+    principal_cache.invalidate(user["user_id"])
+    await bump_data_version(user["user_id"])
+    await push_broker.publish(user["user_id"], "subscription.updated", sub_doc)
     return {"success": True, "subscription": sub_doc}
 
 @app.post("/api/subscription/cancel")
 async def cancel_subscription(user: dict = Depends(get_current_user)):
     """Cancel subscription"""
-    subscriptions_collection.update_one(
-        {"user_id": user["user_id"]},
-        {"$set": {"is_active": False, "cancelled_at": datetime.now(timezone.utc).isoformat()}}
-    )
+    changes = {"is_active": False, "cancelled_at": datetime.now(timezone.utc)}
+    await subscriptions_collection.update_one({"user_id": user["user_id"]}, {"$set": changes})
+    principal_cache.invalidate(user["user_id"])
+    await bump_data_version(user["user_id"])
+    await push_broker.publish(user["user_id"], "subscription.updated", {"user_id": user["user_id"], **changes})
     return {"success": True, "message": "Subscription cancelled"}
 
 # Dashboard stats
-@app.get("/api/dashboard")
-async def get_dashboard(user: dict = Depends(get_current_user)):
-    """Get dashboard overview data"""
-    subscription = check_subscription(user["user_id"])
-    
-    recent_signals = list(signals_collection.find(
-        {"user_id": user["user_id"]},
-        {"_id": 0}
-    ).sort("created_at", -1).limit(5))
-    
-    active_count = signals_collection.count_documents(
-        {"user_id": user["user_id"], "status": "active"}
-    )
-    
-    # Calculate overall confidence
-    all_signals = list(signals_collection.find(
-        {"user_id": user["user_id"]},
-        {"_id": 0, "confidence": 1}
-    ))
-    avg_confidence = round(sum(s.get("confidence", 0) for s in all_signals) / len(all_signals), 1) if all_signals else 0
-    
-    return {
+@app.get("/api/dashboard", response_model=DashboardResponse)
+async def get_dashboard(request: Request, user: dict = Depends(get_current_user)):
+    """Get dashboard overview data (304 when If-None-Match still matches)"""
+    # Counts come from the rollup point read, which also carries the ETag version
+    rollup = await performance_collection.find_one({"user_id": user["user_id"]}, {"_id": 0})
+    # A subscription lapses by the clock without any write, so its effective state is part of the tag
+    subscription = await check_subscription(user["user_id"])
+    etag = rollup_etag(request, user["user_id"], rollup, f"{subscription.get('is_active')}:{subscription.get('expires_at')}")
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+
+    totals = performance_summary(rollup)
+    # Newest five straight off the (user_id, created_at, signal_id) index
+    recent_signals = await signals_collection.find({"user_id": user["user_id"]}, {"_id": 0}).sort(
+        [("created_at", -1), ("signal_id", -1)]
+    ).limit(5).to_list(length=5)
+
+    return ORJSONResponse({
         "subscription": subscription,
-        "active_signals": active_count,
-        "total_signals": len(all_signals),
-        "ai_confidence": avg_confidence,
+        "active_signals": totals["active_signals"],
+        "total_signals": totals["total_signals"],
+        "ai_confidence": totals["avg_confidence"],
         "recent_signals": recent_signals,
         "last_signal_at": recent_signals[0]["created_at"] if recent_signals else None
-    }
+    }, headers={"ETag": etag, "Cache-Control": PRIVATE_REVALIDATE})
 
 # Available assets
 @app.get("/api/assets")
-async def get_assets():
+async def get_assets(request: Request):
     """Get list of available trading assets"""
-    return {
-        "assets": [
-            {"symbol": "BTCUSDT", "name": "Bitcoin", "category": "Crypto"},
-            {"symbol": "ETHUSDT", "name": "Ethereum", "category": "Crypto"},
-            {"symbol": "SOLUSDT", "name": "Solana", "category": "Crypto"},
-            {"symbol": "SPY", "name": "S&P 500 ETF", "category": "Stocks"},
-            {"symbol": "QQQ", "name": "Nasdaq ETF", "category": "Stocks"},
-            {"symbol": "AAPL", "name": "Apple Inc", "category": "Stocks"},
-            {"symbol": "EURUSD", "name": "Euro/USD", "category": "Forex"},
-            {"symbol": "GBPUSD", "name": "GBP/USD", "category": "Forex"},
-            {"symbol": "XAUUSD", "name": "Gold", "category": "Commodities"}
-        ],
-        "timeframes": ["Scalp", "Intraday", "Swing"]
-    }
+    if etag_matches(request, ASSET_CATALOGUE_ETAG):
+        return not_modified(ASSET_CATALOGUE_ETAG, ASSET_CACHE_CONTROL)
+    return Response(
+        ASSET_CATALOGUE_JSON,
+        media_type="application/json",
+        headers={"ETag": ASSET_CATALOGUE_ETAG, "Cache-Control": ASSET_CACHE_CONTROL}
+    )
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "service": "SignalDesk AI", "version": "1.0.0"}
+
+@app.get("/api/stats")
+async def runtime_stats():
+    """Runtime counters for the worker pools and caches"""
+    return {
+        "password_pool": password_pool.stats(),
+        "principal_cache": principal_cache.stats(),
+        "signal_analysis": signal_analysis_stats(),
+        "llm_dispatcher": llm_dispatcher.stats(),
+        "expiry_sweeper": expiry_sweeper.stats(),
+        "fallback_pool": fallback_pool.stats(),
+        "outcome_tracker": outcome_tracker.stats(),
+        "push": {**push_hub.stats(), **push_broker.stats()},
+        "idempotency": idempotency_store.stats(),
+        "rate_limiter": rate_limiter.stats()
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus exposition of request, DB, LLM and password-hashing metrics"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
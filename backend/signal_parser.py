@@ -0,0 +1,152 @@
+"""
+SignalDesk AI - LLM signal reply parser
+Pulls the signal JSON object out of a model reply (bare, inside a fenced code
+block, or surrounded by prose) and validates it against the reply schema in
+one pass.
+
+The object is located by one linear scan that pairs braces, stepping over
+JSON strings whole, so a reply with stray or unbalanced braces costs O(n)
+instead of a backtracking regex.
+Only outermost objects are candidates; the first that decodes is validated
+with pydantic's compiled validator straight from the JSON text.
+
+Every failure is a SignalParseError subclass whose `category` says what went
+wrong, so callers can count failures instead of losing them in a fallback.
+"""
+import re
+from typing import List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Decoding attempts per reply; outermost objects are disjoint, so this bounds work at O(n)
+MAX_CANDIDATES = 4
+
+# Inside an object: a brace, or a whole JSON string (unrolled, so matching is linear;
+# the closing quote is optional so an unterminated string runs to the end)
+_OBJECT_TOKEN = re.compile(r'[{}]|"[^"\\]*(?:\\.[^"\\]*)*"?', re.DOTALL)
+
+class SignalParseError(ValueError):
+    category = "unknown"
+
+class NoJsonObject(SignalParseError):
+    category = "no_object"
+
+class TruncatedObject(SignalParseError):
+    """A `{` is opened but never closed, typically a reply cut off mid-stream"""
+    category = "truncated"
+
+class MalformedJson(SignalParseError):
+    category = "malformed_json"
+
+class SchemaViolation(SignalParseError):
+    category = "schema"
+
+    def __init__(self, message: str, errors: Optional[list] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+class InconsistentLevels(SignalParseError):
+    """Take-profit or stop-loss on the wrong side of entry for the signal direction"""
+    category = "levels"
+
+CATEGORIES = tuple(error.category for error in (
+    NoJsonObject, TruncatedObject, MalformedJson, SchemaViolation, InconsistentLevels
+))
+
+class SignalReply(BaseModel):
+    """Schema of the object SIGNAL_SYSTEM_PROMPT asks the model for"""
+    signal: Literal["BUY", "SELL"]
+    entry: float = Field(gt=0)
+    take_profit: List[float] = Field(min_length=1)
+    stop_loss: Optional[float] = Field(default=None, gt=0)
+    confidence: int = Field(default=75, ge=0, le=100)
+    reasoning: str = ""
+    risk_reward: str = "1:2"
+
+    @field_validator("signal", mode="before")
+    @classmethod
+    def normalise_signal(cls, value):
+        return value.strip().upper() if isinstance(value, str) else value
+
+    @field_validator("confidence", mode="before")
+    @classmethod
+    def round_confidence(cls, value):
+        return round(value) if isinstance(value, float) else value
+
+def fenced_block(text: str) -> Optional[str]:
+    """Body of the first ``` fenced block (language tag dropped), if the reply has one"""
+    start = text.find("```")
+    if start < 0:
+        return None
+    body_start = text.find("\n", start + 3)
+    if body_start < 0:
+        return None
+    end = text.find("```", body_start)
+    return text[body_start + 1:end if end >= 0 else len(text)]
+
+def object_spans(text: str) -> Tuple[List[Tuple[int, int]], bool]:
+    """Outermost balanced {...} spans in order, and whether any `{` was left open"""
+    open_braces = []
+    spans = []
+    position = 0
+    while True:
+        if not open_braces:
+            # Between objects only `{` matters; quotes in prose are ignored
+            position = text.find("{", position)
+            if position < 0:
+                break
+            open_braces.append(position)
+            position += 1
+            continue
+        match = _OBJECT_TOKEN.search(text, position)
+        if match is None:
+            break
+        start, position = match.span()
+        char = text[start]
+        if char == "{":
+            open_braces.append(start)
+        elif char == "}":
+            opened = open_braces.pop()
+            # Inner objects close first; an enclosing span replaces them
+            while spans and spans[-1][0] > opened:
+                spans.pop()
+            spans.append((opened, position))
+    return spans, bool(open_braces)
+
+def parse_signal(text: str) -> dict:
+    """Parse and validate a model reply; raises a SignalParseError subclass on failure"""
+    body = fenced_block(text)
+    spans, unclosed = object_spans(body) if body is not None else ([], False)
+    if not spans:
+        body = text
+        spans, unclosed = object_spans(text)
+    if not spans:
+        if unclosed:
+            raise TruncatedObject("Reply opens a JSON object that is never closed")
+        raise NoJsonObject("No JSON object found in reply")
+
+    first_error = None
+    for start, end in spans[:MAX_CANDIDATES]:
+        try:
+            reply = SignalReply.model_validate_json(body[start:end])
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False, include_input=False)
+            if errors and errors[0]["type"] == "json_invalid":
+                first_error = first_error or MalformedJson(errors[0]["msg"])
+                continue
+            raise SchemaViolation(
+                "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in errors), errors
+            ) from None
+        check_levels(reply)
+        return reply.model_dump()
+    raise first_error
+
+def check_levels(reply: SignalReply):
+    """BUY wants targets above entry and the stop below it; SELL the reverse"""
+    buy = reply.signal == "BUY"
+    for target in reply.take_profit:
+        if (target <= reply.entry) if buy else (target >= reply.entry):
+            raise InconsistentLevels(f"take_profit {target} is on the wrong side of entry {reply.entry} for {reply.signal}")
+    stop = reply.stop_loss
+    if stop is not None and ((stop >= reply.entry) if buy else (stop <= reply.entry)):
+        raise InconsistentLevels(f"stop_loss {stop} is on the wrong side of entry {reply.entry} for {reply.signal}")
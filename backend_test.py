@@ -5,7 +5,11 @@ Tests all backend endpoints for the premium trading signal app
 """
 import requests
 import sys
+import csv
+import gzip
+import io
 import json
+import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -163,10 +167,58 @@ class SignalDeskAPITester:
         
         if success and 'id' in response and 'signal' in response:
             self.signal_id = response['id']
-            self.log_test("Generate AI Signal", True, f"Signal generated: {response['signal']} for {response['asset']}")
+            self.log_test("Generate AI Signal", True,
+                          f"Signal generated: {response['signal']} for {response['asset']} ({response.get('source')})")
         else:
             self.log_test("Generate AI Signal", False, f"Signal generation failed: {response}")
 
+    def test_generate_signal_stream(self):
+        """Test SSE signal generation ends with a terminal signal event"""
+        if not self.token:
+            self.log_test("Generate Signal Stream", False, "No auth token available")
+            return
+
+        url = f"{self.base_url}/signals/generate/stream"
+        headers = {'Authorization': f'Bearer {self.token}'}
+        try:
+            response = requests.post(url, json={"asset": "ETHUSDT", "timeframe": "Scalp"},
+                                     headers=headers, stream=True, timeout=60)
+            events = [line[len("event: "):] for line in response.iter_lines(decode_unicode=True)
+                      if line and line.startswith("event: ")]
+        except requests.exceptions.RequestException as e:
+            self.log_test("Generate Signal Stream", False, f"Request failed: {e}")
+            return
+
+        if response.status_code == 200 and events[:1] == ["start"] and events[-1:] == ["signal"]:
+            self.log_test("Generate Signal Stream", True, f"Received {events.count('chunk')} chunks before final signal")
+        else:
+            self.log_test("Generate Signal Stream", False, f"Unexpected stream: {response.status_code} {events}")
+
+    def test_idempotent_generate(self):
+        """Test that a retried generate with the same Idempotency-Key returns the original signal"""
+        if not self.token:
+            self.log_test("Idempotent Generate", False, "No auth token available")
+            return
+
+        headers = {'Authorization': f'Bearer {self.token}', 'Idempotency-Key': f'test-{uuid.uuid4().hex}'}
+        body = {"asset": "ETHUSDT", "timeframe": "Swing"}
+        try:
+            first = requests.post(f"{self.base_url}/signals/generate", json=body, headers=headers, timeout=60)
+            retry = requests.post(f"{self.base_url}/signals/generate", json=body, headers=headers, timeout=60)
+            reused = requests.post(
+                f"{self.base_url}/signals/generate", json={**body, "asset": "BTCUSDT"}, headers=headers, timeout=60
+            )
+        except requests.exceptions.RequestException as e:
+            self.log_test("Idempotent Generate", False, f"Request failed: {e}")
+            return
+
+        if first.status_code == 200 and retry.status_code == 200 and first.content == retry.content \
+                and retry.headers.get('Idempotent-Replayed') == 'true' and reused.status_code == 422:
+            self.log_test("Idempotent Generate", True, f"Retry replayed signal {first.json()['id']}")
+        else:
+            self.log_test("Idempotent Generate", False,
+                          f"first {first.status_code}, retry {retry.status_code}, reused key {reused.status_code}")
+
     def test_get_signals_list(self):
         """Test GET /api/signals"""
         if not self.token:
@@ -185,6 +237,35 @@ class SignalDeskAPITester:
         else:
             self.log_test("Get Signals List", False, f"Failed to get signals: {response}")
 
+    def test_export_signals(self):
+        """Test that NDJSON, CSV and gzipped exports all carry the full history"""
+        if not self.token:
+            self.log_test("Export Signals", False, "No auth token available")
+            return
+
+        headers = {'Authorization': f'Bearer {self.token}'}
+        try:
+            ndjson = requests.get(f"{self.base_url}/signals/export", headers=headers, timeout=60)
+            csv_export = requests.get(f"{self.base_url}/signals/export", params={"format": "csv"}, headers=headers, timeout=60)
+            gzipped = requests.get(
+                f"{self.base_url}/signals/export", params={"format": "csv", "gzip": "true"}, headers=headers,
+                timeout=60, stream=True
+            )
+            gzipped_body = gzip.decompress(gzipped.raw.read())
+        except (requests.exceptions.RequestException, OSError) as e:
+            self.log_test("Export Signals", False, f"Request failed: {e}")
+            return
+
+        rows = [json.loads(line) for line in ndjson.text.splitlines()]
+        csv_rows = list(csv.reader(io.StringIO(csv_export.text)))
+        if ndjson.status_code == 200 and rows and csv_export.status_code == 200 \
+                and len(csv_rows) == len(rows) + 1 and gzipped_body.decode() == csv_export.text \
+                and [row['created_at'] for row in rows] == sorted(row['created_at'] for row in rows):
+            self.log_test("Export Signals", True, f"{len(rows)} signals exported as NDJSON, CSV and gzip")
+        else:
+            self.log_test("Export Signals", False,
+                          f"ndjson {ndjson.status_code} ({len(rows)} rows), csv {csv_export.status_code} ({len(csv_rows)} lines)")
+
     def test_get_dashboard_data(self):
         """Test GET /api/dashboard"""
         if not self.token:
@@ -219,6 +300,174 @@ class SignalDeskAPITester:
         else:
             self.log_test("Get Performance Stats", False, f"Failed to get performance: {response}")
 
+    def test_performance_rollup_consistency(self):
+        """Test /api/performance rollups agree with the raw signal list"""
+        if not self.token:
+            self.log_test("Performance Rollup Consistency", False, "No auth token available")
+            return
+
+        signal_id = getattr(self, 'signal_id', None)
+        if signal_id:
+            self.make_request('PATCH', f'signals/{signal_id}/status?status=hit_tp', auth_required=True)
+
+        ok_signals, signals = self.make_request('GET', 'signals?limit=100', auth_required=True)
+        ok_perf, performance = self.make_request('GET', 'performance', auth_required=True)
+        if not (ok_signals and ok_perf):
+            self.log_test("Performance Rollup Consistency", False, f"Requests failed: {signals} {performance}")
+            return
+
+        statuses = [s.get('status') for s in signals.get('signals', [])]
+        expected = {
+            'total_signals': len(statuses),
+            'active_signals': statuses.count('active'),
+            'hit_tp': statuses.count('hit_tp'),
+            'stopped_out': statuses.count('stopped_out'),
+        }
+        actual = {key: performance.get(key) for key in expected}
+        if actual == expected:
+            self.log_test("Performance Rollup Consistency", True, f"Rollups match raw signals: {actual}")
+        else:
+            self.log_test("Performance Rollup Consistency", False, f"Expected {expected}, got {actual}")
+
+    def test_performance_timeseries(self):
+        """Test /api/performance/timeseries buckets add up to the lifetime rollup"""
+        if not self.token:
+            self.log_test("Performance Timeseries", False, "No auth token available")
+            return
+
+        ok_daily, daily = self.make_request('GET', 'performance/timeseries?interval=day', auth_required=True)
+        ok_weekly, weekly = self.make_request('GET', 'performance/timeseries?interval=week', auth_required=True)
+        ok_perf, performance = self.make_request('GET', 'performance', auth_required=True)
+        if not (ok_daily and ok_weekly and ok_perf):
+            self.log_test("Performance Timeseries", False, f"Requests failed: {daily} {weekly} {performance}")
+            return
+
+        # Every signal in this run was created just now, inside both default windows
+        keys = ('total_signals', 'active_signals', 'hit_tp', 'stopped_out')
+        expected = {key: performance.get(key) for key in keys}
+        sums = [{key: sum(point.get(key, 0) for point in series.get('points', [])) for key in keys}
+                for series in (daily, weekly)]
+        totals = [{key: series.get('totals', {}).get(key) for key in keys} for series in (daily, weekly)]
+        if all(result == expected for result in sums + totals) and len(daily.get('points', [])) >= 28:
+            self.log_test("Performance Timeseries", True,
+                          f"{len(daily['points'])} daily / {len(weekly['points'])} weekly points sum to {expected}")
+        else:
+            self.log_test("Performance Timeseries", False, f"Expected {expected}, got sums {sums} totals {totals}")
+
+    def test_conditional_get(self):
+        """Test ETag / If-None-Match on /api/dashboard and /api/assets"""
+        if not self.token:
+            self.log_test("Conditional GET", False, "No auth token available")
+            return
+
+        headers = {'Authorization': f'Bearer {self.token}'}
+        try:
+            first = requests.get(f"{self.base_url}/dashboard", headers=headers, timeout=30)
+            etag = first.headers.get('ETag')
+            repeat = requests.get(f"{self.base_url}/dashboard", headers={**headers, 'If-None-Match': etag or ''}, timeout=30)
+            assets = requests.get(f"{self.base_url}/assets", timeout=30)
+            assets_repeat = requests.get(
+                f"{self.base_url}/assets", headers={'If-None-Match': assets.headers.get('ETag', '')}, timeout=30
+            )
+        except requests.exceptions.RequestException as e:
+            self.log_test("Conditional GET", False, f"Request failed: {e}")
+            return
+
+        if etag and repeat.status_code == 304 and assets_repeat.status_code == 304 \
+                and 'max-age' in assets.headers.get('Cache-Control', ''):
+            self.log_test("Conditional GET", True, f"Dashboard and assets answer 304 for ETag {etag}")
+        else:
+            self.log_test("Conditional GET", False,
+                          f"dashboard {first.status_code}->{repeat.status_code}, assets {assets.status_code}->{assets_repeat.status_code}")
+
+    def test_query_plans(self):
+        """Explain each route's query shape; fail if any falls back to COLLSCAN.
+
+        Needs direct database access: set MONGO_URL and DB_NAME to the
+        database the server under test uses, otherwise the check is skipped.
+        """
+        import os
+        if not (os.environ.get('MONGO_URL') and os.environ.get('DB_NAME')):
+            print("⏭️  Query Plans - SKIPPED (set MONGO_URL and DB_NAME to run)")
+            return
+        from datetime import timezone
+        from pymongo import MongoClient
+
+        db = MongoClient(os.environ['MONGO_URL'])[os.environ['DB_NAME']]
+        user_id = self.user_id or 'missing-user'
+        now = datetime.now(timezone.utc)
+        newest_first = [('created_at', -1), ('signal_id', -1)]
+        shapes = {
+            'signals list': ('signals', {'user_id': user_id}, newest_first),
+            'signals list by status': ('signals', {'user_id': user_id, 'status': 'active'}, newest_first),
+            'signals list by asset': ('signals', {'user_id': user_id, 'asset': 'BTCUSDT'}, newest_first),
+            'signals list next page': ('signals', {'user_id': user_id, '$or': [
+                {'created_at': {'$lt': now}}, {'created_at': now, 'signal_id': {'$lt': 'z'}}
+            ]}, newest_first),
+            'signal detail / status update': ('signals', {'signal_id': getattr(self, 'signal_id', 'x'), 'user_id': user_id}, None),
+            'bulk resolution': ('signals', {'user_id': user_id, 'signal_id': {'$in': ['x']}, 'status': 'active'}, None),
+            'expiry sweep': ('signals', {'status': 'active', 'expires_at': {'$lte': now}}, None),
+            'outcome tracker load': ('signals', {'status': 'active'}, None),
+            'login': ('users', {'email': self.test_user['email']}, None),
+            'principal load': ('users', {'user_id': user_id}, None),
+            'subscription load': ('subscriptions', {'user_id': user_id}, None),
+            'dashboard recent signals': ('signals', {'user_id': user_id}, newest_first),
+            'performance rollup': ('performance_stats', {'user_id': user_id}, None),
+            'performance timeseries': ('performance_daily', {'user_id': user_id, 'day': {'$gte': now, '$lt': now}}, None),
+        }
+
+        def stages(plan, winning=False):
+            # Only stages under a winningPlan count; rejected plans may still list a COLLSCAN
+            if isinstance(plan, dict):
+                if winning and 'stage' in plan:
+                    yield plan['stage']
+                for key, value in plan.items():
+                    if key != 'rejectedPlans':
+                        yield from stages(value, winning or key in ('winningPlan', 'queryPlan'))
+            elif isinstance(plan, list):
+                for value in plan:
+                    yield from stages(value, winning)
+
+        scans = []
+        for name, (collection, query, sort) in shapes.items():
+            cursor = db[collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort).limit(21)
+            if 'COLLSCAN' in stages(cursor.explain()):
+                scans.append(name)
+
+        if scans:
+            self.log_test("Query Plans", False, f"COLLSCAN in: {', '.join(scans)}")
+        else:
+            self.log_test("Query Plans", True, f"{len(shapes)} route queries use indexes")
+
+    def test_generation_rate_limit(self):
+        """Test that repeated generation is eventually refused with 429 and Retry-After"""
+        if not self.token:
+            self.log_test("Generation Rate Limit", False, "No auth token available")
+            return
+
+        headers = {'Authorization': f'Bearer {self.token}'}
+        try:
+            for attempt in range(1, 31):
+                response = requests.post(
+                    f"{self.base_url}/signals/generate", json={"asset": "SOLUSDT", "timeframe": "Scalp"},
+                    headers=headers, timeout=60
+                )
+                if response.status_code != 200:
+                    break
+        except requests.exceptions.RequestException as e:
+            self.log_test("Generation Rate Limit", False, f"Request failed: {e}")
+            return
+
+        if response.status_code == 200:
+            print(f"⏭️  Generation Rate Limit - SKIPPED (no 429 within {attempt} requests; plan limit is higher)")
+        elif response.status_code == 429 and response.headers.get('Retry-After', '').isdigit():
+            self.log_test("Generation Rate Limit", True,
+                          f"429 after {attempt} requests, Retry-After {response.headers['Retry-After']}s")
+        else:
+            self.log_test("Generation Rate Limit", False, f"Status: {response.status_code}, Response: {response.text[:200]}")
+
     def test_get_subscription_status(self):
         """Test GET /api/subscription"""
         if not self.token:
@@ -260,11 +509,19 @@ class SignalDeskAPITester:
         self.test_user_login()
         self.test_get_current_user()
         self.test_generate_ai_signal()
+        self.test_generate_signal_stream()
+        self.test_idempotent_generate()
         self.test_get_signals_list()
+        self.test_export_signals()
         self.test_get_dashboard_data()
         self.test_get_performance_stats()
+        self.test_performance_rollup_consistency()
+        self.test_performance_timeseries()
+        self.test_conditional_get()
+        self.test_query_plans()
         self.test_get_subscription_status()
         self.test_get_available_assets()
+        self.test_generation_rate_limit()
         
         # Print summary
         print("=" * 60)
@@ -281,7 +538,7 @@ class SignalDeskAPITester:
 
 def main():
     """Main test runner"""
-    tester = SignalDeskAPITester()
+    tester = SignalDeskAPITester(sys.argv[1]) if len(sys.argv) > 1 else SignalDeskAPITester()
     return tester.run_all_tests()
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+"""
+SignalDesk AI - ASGI entry point for local benchmarks
+Imports backend/server.py with the fake LLM client installed and, when
+BENCH_MONGOMOCK=1, an in-memory mongomock-motor client instead of Motor.
+
+    uvicorn bench_server:app --app-dir benchmarks
+"""
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "backend"))
+
+import fake_llm
+
+fake_llm.install()
+
+if os.environ.get("BENCH_MONGOMOCK") == "1":
+    import motor.motor_asyncio
+    from mongomock_motor import AsyncMongoMockClient
+
+    class MockClient(AsyncMongoMockClient):
+        def __init__(self, *args, **kwargs):
+            super().__init__()
+
+    motor.motor_asyncio.AsyncIOMotorClient = MockClient
+
+from server import app  # noqa: E402
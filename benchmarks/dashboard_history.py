@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Dashboard benchmark for users with a long signal history
+Registers a user through the API, seeds their history straight into MongoDB,
+then times GET /api/dashboard. Point MONGO_URL/DB_NAME at the same database
+the server uses.
+
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=signaldesk \
+        python benchmarks/dashboard_history.py --signals 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from pymongo import MongoClient
+
+from mixed_load import percentile
+
+ASSETS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "SPY", "QQQ", "AAPL", "EURUSD", "GBPUSD", "XAUUSD"]
+TIMEFRAMES = ["Scalp", "Intraday", "Swing"]
+STATUSES = ["active", "hit_tp", "stopped_out", "expired"]
+
+def synthetic_signal(user_id: str, created_at: datetime) -> dict:
+    entry = round(random.uniform(1, 50000), 2)
+    return {
+        "signal_id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "asset": random.choice(ASSETS),
+        "signal": random.choice(["BUY", "SELL"]),
+        "entry": entry,
+        "take_profit": [round(entry * 1.02, 2), round(entry * 1.04, 2)],
+        "stop_loss": round(entry * 0.98, 2),
+        "confidence": random.randint(50, 95),
+        "timeframe": random.choice(TIMEFRAMES),
+        "status": random.choice(STATUSES),
+        "ai_reasoning": "Synthetic benchmark signal. " * 8,
+        "risk_reward": "1:2",
+        "created_at": created_at,
+        "expires_at": created_at + timedelta(hours=8),
+    }
+
+def seed_signals(user_id: str, count: int, batch_size: int = 5000):
+    """Insert count signals, one per minute up to now, and bump the user's rollup to match"""
+    client = MongoClient(os.environ["MONGO_URL"])
+    db = client[os.environ["DB_NAME"]]
+    start = datetime.now(timezone.utc) - timedelta(minutes=count)
+    for offset in range(0, count, batch_size):
+        batch = [
+            synthetic_signal(user_id, start + timedelta(minutes=offset + i))
+            for i in range(min(batch_size, count - offset))
+        ]
+        db["signals"].insert_many(batch, ordered=False)
+        increments = {"total_signals": len(batch), "confidence_sum": sum(doc["confidence"] for doc in batch), "version": 1}
+        for doc in batch:
+            increments[f"status.{doc['status']}"] = increments.get(f"status.{doc['status']}", 0) + 1
+        db["performance_stats"].update_one({"user_id": user_id}, {"$inc": increments}, upsert=True)
+    client.close()
+
+async def run_benchmark(base_url: str, signals: int, requests: int) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        response = await client.post("/auth/register", json={
+            "email": f"history_{uuid.uuid4().hex[:12]}@signaldesk.ai",
+            "password": "historypass123",
+            "name": "History User",
+        })
+        response.raise_for_status()
+        body = response.json()
+        headers = {"Authorization": f"Bearer {body['access_token']}"}
+
+        seeded = time.perf_counter()
+        seed_signals(body["user"]["user_id"], signals)
+        seed_seconds = time.perf_counter() - seeded
+
+        latencies = []
+        payload_bytes = 0
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/dashboard", headers=headers)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+            payload_bytes = len(response.content)
+
+        return {
+            "signals": signals,
+            "seed_s": round(seed_seconds, 2),
+            "dashboard": {
+                "requests": requests,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "payload_bytes": payload_bytes,
+                "total_signals_reported": response.json()["total_signals"],
+            },
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk dashboard history benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8001/api")
+    parser.add_argument("--signals", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.base_url, args.signals, args.requests))
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
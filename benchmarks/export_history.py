@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Signal history export benchmark
+Seeds one user with a large synthetic history straight into MongoDB, streams
+GET /api/signals/export in each requested format, and samples the server's
+resident memory while it streams. Exits non-zero if a row goes missing or
+RSS grows by more than --max-rss-growth-mb during an export.
+
+    python benchmarks/export_history.py --mongo-url mongodb://localhost:27017 --signals 1000000
+    MONGO_URL=mongodb://localhost:27017 DB_NAME=signaldesk \
+        python benchmarks/export_history.py --base-url http://localhost:8001/api --signals 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+import zlib
+
+import httpx
+
+from dashboard_history import seed_signals
+from loadtest import LocalServer
+from push_fanout import server_rss_mb
+
+async def sample_rss(pid, samples: list, stop: asyncio.Event):
+    while not stop.is_set():
+        rss = server_rss_mb(pid)
+        if rss is not None:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+
+async def export_once(client, headers, export_format: str, compress: bool, pid) -> dict:
+    params = {"format": export_format, "gzip": "true" if compress else "false"}
+    decompressor = zlib.decompressobj(31) if compress else None
+    rss_before = server_rss_mb(pid) if pid else None
+    samples, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(pid, samples, stop)) if pid else None
+
+    wire_bytes = rows = 0
+    started = time.perf_counter()
+    first_byte = None
+    async with client.stream("GET", "/signals/export", params=params, headers=headers) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_raw():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            wire_bytes += len(chunk)
+            data = decompressor.decompress(chunk) if decompressor else chunk
+            rows += data.count(b"\n")
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    if sampler:
+        await sampler
+    if export_format == "csv":
+        rows -= 1  # header line
+    peak = max(samples) if samples else None
+    return {
+        "format": export_format,
+        "gzip": compress,
+        "rows": rows,
+        "wire_mb": round(wire_bytes / 1e6, 1),
+        "seconds": round(elapsed, 2),
+        "rows_per_s": round(rows / elapsed) if elapsed else 0,
+        "first_byte_ms": round((first_byte or 0) * 1000, 1),
+        "server_rss_mb": {
+            "before": rss_before,
+            "peak": peak,
+            "growth": round(peak - rss_before, 1) if peak is not None and rss_before is not None else None,
+        },
+    }
+
+async def run_benchmark(base_url: str, args, pid=None) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        email = f"export_{uuid.uuid4().hex[:12]}@signaldesk.ai"
+        response = await client.post("/auth/register", json={"email": email, "password": "exportpass123", "name": "Export User"})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        user_id = (await client.get("/auth/me", headers=headers)).json()["user_id"]
+
+        started = time.perf_counter()
+        await asyncio.to_thread(seed_signals, user_id, args.signals)
+        seed_seconds = time.perf_counter() - started
+
+        exports = []
+        for variant in args.variants.split(","):
+            export_format, _, compression = variant.partition("+")
+            exports.append(await export_once(client, headers, export_format, compression == "gzip", pid))
+    return {"signals": args.signals, "seed_seconds": round(seed_seconds, 1), "exports": exports}
+
+async def main_async(args) -> dict:
+    if args.base_url:
+        return await run_benchmark(args.base_url, args)
+    async with LocalServer(args.mongo_url, False, llm_latency_ms=0) as server:
+        # seed_signals writes to the database named by these variables
+        os.environ["MONGO_URL"] = args.mongo_url
+        os.environ["DB_NAME"] = server.db_name
+        return await run_benchmark(server.base_url, args, server.process.pid)
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk signal export benchmark")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--mongo-url", help="local MongoDB to create a throwaway database on")
+    target.add_argument("--base-url", help="running server sharing MONGO_URL/DB_NAME (no RSS sampling)")
+    parser.add_argument("--signals", type=int, default=1000000)
+    parser.add_argument("--variants", default="ndjson,csv,ndjson+gzip", help="format[+gzip],...")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64.0)
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print(json.dumps(report, indent=2))
+    failures = [
+        export for export in report["exports"]
+        if export["rows"] != args.signals
+        or (export["server_rss_mb"]["growth"] or 0) > args.max_rss_growth_mb
+    ]
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+SignalDesk AI - Fake LLM client for local benchmarks and tests
+Drop-in stand-in for `emergentintegrations.llm.chat` that answers with a
+canned, asset-plausible signal after a configurable delay and can stream the
+reply in chunks.
+
+    FAKE_LLM_LATENCY_MS   reply latency (default 200)
+    FAKE_LLM_CHUNK_SIZE   characters per streamed chunk (default 24)
+    FAKE_LLM_FAILURE_RATE fraction of calls that raise (default 0)
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import types
+
+REFERENCE_PRICES = {
+    "BTCUSDT": 42000.0, "ETHUSDT": 2800.0, "SOLUSDT": 100.0, "SPY": 480.0, "QQQ": 410.0,
+    "AAPL": 190.0, "EURUSD": 1.09, "GBPUSD": 1.27, "XAUUSD": 2030.0,
+}
+
+class UserMessage:
+    def __init__(self, text: str):
+        self.text = text
+
+class LlmChat:
+    calls = 0
+
+    def __init__(self, api_key=None, session_id=None, system_message=None):
+        self.session_id = session_id
+
+    def with_model(self, provider: str, model: str):
+        return self
+
+    def _reply(self, message: UserMessage) -> str:
+        match = re.search(r"signal for (\S+)", message.text)
+        asset = match.group(1) if match else "BTCUSDT"
+        price = REFERENCE_PRICES.get(asset, 100.0) * random.uniform(0.99, 1.01)
+        side = random.choice(["BUY", "SELL"])
+        step = price * 0.01 * (1 if side == "BUY" else -1)
+        payload = {
+            "signal": side,
+            "entry": round(price, 4),
+            "take_profit": [round(price + step, 4), round(price + 2 * step, 4)],
+            "stop_loss": round(price - step, 4),
+            "confidence": random.randint(60, 90),
+            "reasoning": f"Fake analysis for {asset}: momentum and volume are constructive.",
+            "risk_reward": "1:2",
+        }
+        return f"Here is the signal:\n```json\n{json.dumps(payload, indent=2)}\n```\nTrade carefully."
+
+    async def send_message(self, message: UserMessage) -> str:
+        LlmChat.calls += 1
+        await asyncio.sleep(float(os.environ.get("FAKE_LLM_LATENCY_MS", 200)) / 1000)
+        if random.random() < float(os.environ.get("FAKE_LLM_FAILURE_RATE", 0)):
+            raise RuntimeError("fake provider failure")
+        return self._reply(message)
+
+    async def stream_message(self, message: UserMessage):
+        reply = await self.send_message(message)
+        size = int(os.environ.get("FAKE_LLM_CHUNK_SIZE", 24))
+        for start in range(0, len(reply), size):
+            await asyncio.sleep(0)
+            yield reply[start:start + size]
+
+def install():
+    """Register this module as emergentintegrations.llm.chat before server is imported"""
+    package = sys.modules.setdefault("emergentintegrations", types.ModuleType("emergentintegrations"))
+    llm = sys.modules.setdefault("emergentintegrations.llm", types.ModuleType("emergentintegrations.llm"))
+    package.llm = llm
+    llm.chat = sys.modules[__name__]
+    sys.modules["emergentintegrations.llm.chat"] = sys.modules[__name__]
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Reproducible local load test
+Starts backend/server.py under uvicorn against a disposable database (a
+throwaway DB on a local MongoDB, or in-memory mongomock) with the fake LLM
+client, drives concurrent workload phases with an async HTTP client, and
+writes per-endpoint throughput and p50/p95/p99 latency to JSON so runs from
+different commits can be compared.
+
+    python benchmarks/loadtest.py --mongo-url mongodb://localhost:27017 --out results.json
+    python benchmarks/loadtest.py --mongomock --out results.json --compare baseline.json
+
+Phases: login_storm, dashboard_polling, signal_generation, list_pagination, mixed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import httpx
+
+from mixed_load import summarize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ASSETS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "SPY", "QQQ", "AAPL", "EURUSD", "GBPUSD", "XAUUSD"]
+TIMEFRAMES = ["Scalp", "Intraday", "Swing"]
+PHASES = ["login_storm", "dashboard_polling", "signal_generation", "list_pagination", "mixed"]
+
+# Operations: each returns (endpoint label, response)
+async def op_login(client, user, state):
+    return "POST /auth/login", await client.post(
+        "/auth/login", json={"email": user["email"], "password": user["password"]}
+    )
+
+async def op_dashboard(client, user, state):
+    return "GET /dashboard", await client.get("/dashboard", headers=user["headers"])
+
+async def op_generate(client, user, state):
+    body = {"asset": random.choice(ASSETS), "timeframe": random.choice(TIMEFRAMES)}
+    return "POST /signals/generate", await client.post("/signals/generate", json=body, headers=user["headers"])
+
+async def op_paginate(client, user, state):
+    params = {"limit": 20, "compact": "true"}
+    cursor = state.get(user["email"])
+    if cursor:
+        params["cursor"] = cursor
+    response = await client.get("/signals", params=params, headers=user["headers"])
+    if response.status_code == 200:
+        state[user["email"]] = response.json().get("next_cursor")
+    return "GET /signals", response
+
+PHASE_OPERATIONS = {
+    "login_storm": [(op_login, 1)],
+    "dashboard_polling": [(op_dashboard, 1)],
+    "signal_generation": [(op_generate, 1)],
+    "list_pagination": [(op_paginate, 1)],
+    "mixed": [(op_dashboard, 40), (op_paginate, 30), (op_generate, 15), (op_login, 5)],
+}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+class LocalServer:
+    """uvicorn running bench_server:app against a throwaway database"""
+
+    def __init__(self, mongo_url: str, mongomock: bool, llm_latency_ms: int, uvicorn_args=()):
+        self.port = free_port()
+        self.uvicorn_args = list(uvicorn_args)
+        self.mongo_url = mongo_url
+        self.mongomock = mongomock
+        self.db_name = f"signaldesk_bench_{uuid.uuid4().hex[:8]}"
+        self.env = {
+            **os.environ,
+            "MONGO_URL": mongo_url or "mongodb://localhost:27017",
+            "DB_NAME": self.db_name,
+            "JWT_SECRET": os.environ.get("JWT_SECRET", "bench-secret"),
+            "BENCH_MONGOMOCK": "1" if mongomock else "0",
+            "FAKE_LLM_LATENCY_MS": str(llm_latency_ms),
+            # Load phases generate far faster than any plan allows
+            "RATE_LIMIT_GENERATE": os.environ.get("RATE_LIMIT_GENERATE", "*:1000000:100000"),
+            "GENERATION_DAILY_QUOTA": os.environ.get("GENERATION_DAILY_QUOTA", "*:100000000"),
+        }
+        self.process = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/api"
+
+    async def __aenter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "bench_server:app", "--app-dir", HERE,
+             "--port", str(self.port), "--log-level", "warning", *self.uvicorn_args],
+            env=self.env,
+        )
+        async with httpx.AsyncClient(base_url=self.base_url) as client:
+            for _ in range(100):
+                if self.process.poll() is not None:
+                    raise RuntimeError("benchmark server exited during startup")
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        return self
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError("benchmark server did not become healthy")
+
+    async def __aexit__(self, *exc):
+        self.process.terminate()
+        self.process.wait(timeout=15)
+        if not self.mongomock:
+            from pymongo import MongoClient
+
+            client = MongoClient(self.mongo_url)
+            client.drop_database(self.db_name)
+            client.close()
+
+async def create_users(client: httpx.AsyncClient, count: int, signals_per_user: int) -> List[dict]:
+    users = []
+    for _ in range(count):
+        creds = {"email": f"load_{uuid.uuid4().hex[:12]}@signaldesk.ai", "password": "loadpass123", "name": "Load User"}
+        response = await client.post("/auth/register", json=creds)
+        response.raise_for_status()
+        user = {**creds, "headers": {"Authorization": f"Bearer {response.json()['access_token']}"}}
+        # Seed history through the batch endpoint so pagination has pages to walk
+        for _ in range(0, signals_per_user, 20):
+            items = [{"asset": random.choice(ASSETS), "timeframe": random.choice(TIMEFRAMES)} for _ in range(20)]
+            await client.post("/signals/generate/batch", json={"items": items}, headers=user["headers"])
+        users.append(user)
+    return users
+
+async def run_phase(client, users, operations, concurrency: int, duration: float) -> dict:
+    functions = [fn for fn, _ in operations]
+    weights = [weight for _, weight in operations]
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    state: dict = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            operation = random.choices(functions, weights)[0]
+            user = random.choice(users)
+            started = time.perf_counter()
+            try:
+                label, response = await operation(client, user, state)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                label, ok = operation.__name__, False
+            latencies.setdefault(label, []).append(time.perf_counter() - started)
+            if not ok:
+                errors[label] = errors.get(label, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+async def run_suite(args) -> dict:
+    random.seed(args.seed)
+    phases = args.phases.split(",")
+
+    async def drive(base_url: str) -> dict:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            users = await create_users(client, args.users, args.signals_per_user)
+            results = {}
+            for phase in phases:
+                results[phase] = await run_phase(
+                    client, users, PHASE_OPERATIONS[phase], args.concurrency, args.duration
+                )
+                print(f"{phase}: {results[phase]['overall']}", file=sys.stderr)
+            return results
+
+    if args.base_url:
+        results = await drive(args.base_url)
+    else:
+        async with LocalServer(args.mongo_url, args.mongomock, args.llm_latency_ms) as server:
+            results = await drive(server.base_url)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": "mongomock" if args.mongomock else (args.mongo_url or "external"),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "users": args.users,
+            "signals_per_user": args.signals_per_user,
+            "llm_latency_ms": args.llm_latency_ms,
+            "seed": args.seed,
+        },
+        "phases": results,
+    }
+
+def compare(report: dict, baseline: dict):
+    """Print p50/p99 changes per phase and endpoint against an earlier run"""
+    print(f"\nCompared with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}):")
+    for phase, summary in report["phases"].items():
+        old_phase = baseline.get("phases", {}).get(phase, {}).get("endpoints", {})
+        for endpoint, stats in summary["endpoints"].items():
+            old = old_phase.get(endpoint)
+            if not old:
+                continue
+            deltas = []
+            for key in ("rps", "p50_ms", "p99_ms"):
+                change = (stats[key] - old[key]) / old[key] * 100 if old[key] else 0
+                deltas.append(f"{key} {old[key]} -> {stats[key]} ({change:+.1f}%)")
+            print(f"  {phase:18} {endpoint:24} " + ", ".join(deltas))
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk local load test")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--mongo-url", help="local MongoDB to create a throwaway database on")
+    target.add_argument("--mongomock", action="store_true", help="run the server on in-memory mongomock-motor")
+    target.add_argument("--base-url", help="drive an already running server instead of starting one")
+    parser.add_argument("--phases", default=",".join(PHASES))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per phase")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--signals-per-user", type=int, default=100)
+    parser.add_argument("--llm-latency-ms", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", help="write the JSON report to this path")
+    parser.add_argument("--compare", help="earlier JSON report to diff against")
+    args = parser.parse_args()
+
+    unknown = set(args.phases.split(",")) - set(PHASES)
+    if unknown:
+        parser.error(f"unknown phases: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run_suite(args))
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Login storm benchmark
+Floods /api/auth/login with concurrent bcrypt work while a separate reader
+polls /api/signals, and reports how read latency holds up during the storm.
+
+    python benchmarks/login_storm.py --base-url http://localhost:8001/api --logins 200
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+from mixed_load import percentile
+
+async def register(client: httpx.AsyncClient) -> dict:
+    creds = {
+        "email": f"storm_{uuid.uuid4().hex[:12]}@signaldesk.ai",
+        "password": "stormpass123",
+        "name": "Storm User",
+    }
+    response = await client.post("/auth/register", json=creds)
+    response.raise_for_status()
+    return {**creds, "token": response.json()["access_token"]}
+
+async def login_storm(client, user, total, concurrency, outcomes):
+    remaining = iter(range(total))
+
+    async def attempt():
+        for _ in remaining:
+            response = await client.post(
+                "/auth/login", json={"email": user["email"], "password": user["password"]}
+            )
+            outcomes[response.status_code] += 1
+
+    await asyncio.gather(*(attempt() for _ in range(concurrency)))
+
+async def poll_signals(client, user, stop: asyncio.Event, interval: float, samples):
+    headers = {"Authorization": f"Bearer {user['token']}"}
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/signals", headers=headers)
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+
+async def run_benchmark(base_url, logins, concurrency, interval) -> dict:
+    limits = httpx.Limits(max_connections=concurrency + 5)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        user = await register(client)
+        baseline, during = [], []
+
+        stop = asyncio.Event()
+        reader = asyncio.create_task(poll_signals(client, user, stop, interval, baseline))
+        await asyncio.sleep(2)
+        stop.set()
+        await reader
+
+        outcomes = Counter()
+        stop = asyncio.Event()
+        reader = asyncio.create_task(poll_signals(client, user, stop, interval, during))
+        started = time.perf_counter()
+        await login_storm(client, user, logins, concurrency, outcomes)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await reader
+
+        def describe(samples):
+            return {
+                "samples": len(samples),
+                "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                "p99_ms": round(percentile(samples, 99) * 1000, 2),
+                "max_ms": round(max(samples, default=0) * 1000, 2),
+            }
+
+        stats = (await client.get("/stats")).json()
+        return {
+            "logins": {
+                "total": logins,
+                "elapsed_s": round(elapsed, 2),
+                "status_codes": dict(outcomes),
+            },
+            "signals_idle": describe(baseline),
+            "signals_during_storm": describe(during),
+            "password_pool": stats.get("password_pool"),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk login storm benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8001/api")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between signal reads")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.base_url, args.logins, args.concurrency, args.interval))
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
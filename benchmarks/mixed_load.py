@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Mixed-load concurrency benchmark
+Drives concurrent login / dashboard / signals / performance traffic against a
+running backend and reports per-endpoint p50/p95/p99 latency.
+
+Run it once against a server built from the commit before the async Mongo
+layer and once against the current tree to compare tail latency:
+
+    uvicorn server:app --port 8001 --workers 1
+    python benchmarks/mixed_load.py --base-url http://localhost:8001/api
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+# Relative weight of each operation in the mixed workload
+WORKLOAD = [
+    ("dashboard", 40),
+    ("signals", 30),
+    ("performance", 20),
+    ("login", 10),
+]
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> dict:
+    report = {"elapsed_s": round(elapsed, 2), "endpoints": {}}
+    all_samples = []
+    for name, samples in latencies.items():
+        all_samples.extend(samples)
+        report["endpoints"][name] = {
+            "requests": len(samples),
+            "errors": errors.get(name, 0),
+            "rps": round(len(samples) / elapsed, 1) if elapsed else 0,
+            "p50_ms": round(percentile(samples, 50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        }
+    report["overall"] = {
+        "requests": len(all_samples),
+        "rps": round(len(all_samples) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(all_samples, 50) * 1000, 2),
+        "p99_ms": round(percentile(all_samples, 99) * 1000, 2),
+    }
+    return report
+
+async def create_users(client: httpx.AsyncClient, count: int) -> List[dict]:
+    """Register throwaway benchmark users and return their credentials + tokens"""
+    users = []
+    for _ in range(count):
+        creds = {
+            "email": f"bench_{uuid.uuid4().hex[:12]}@signaldesk.ai",
+            "password": "benchpass123",
+            "name": "Bench User",
+        }
+        response = await client.post("/auth/register", json=creds)
+        response.raise_for_status()
+        users.append({**creds, "token": response.json()["access_token"]})
+    return users
+
+async def run_operation(client: httpx.AsyncClient, name: str, user: dict) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {user['token']}"}
+    if name == "login":
+        return await client.post("/auth/login", json={"email": user["email"], "password": user["password"]})
+    if name == "signals":
+        return await client.get("/signals", headers=headers)
+    return await client.get(f"/{name}", headers=headers)
+
+async def worker(client, users, deadline, latencies, errors):
+    names = [name for name, _ in WORKLOAD]
+    weights = [weight for _, weight in WORKLOAD]
+    while time.perf_counter() < deadline:
+        name = random.choices(names, weights)[0]
+        user = random.choice(users)
+        started = time.perf_counter()
+        try:
+            response = await run_operation(client, name, user)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        latencies[name].append(time.perf_counter() - started)
+        if not ok:
+            errors[name] = errors.get(name, 0) + 1
+
+async def run_benchmark(base_url: str, concurrency: int, duration: float, user_count: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        users = await create_users(client, user_count)
+        latencies = {name: [] for name, _ in WORKLOAD}
+        errors: Dict[str, int] = {}
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            worker(client, users, deadline, latencies, errors) for _ in range(concurrency)
+        ))
+        return summarize(latencies, errors, time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk mixed-load benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8001/api")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--out", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.base_url, args.concurrency, args.duration, args.users))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Outcome resolver throughput benchmark
+Loads open signals into the in-memory resolver and replays a random-walk
+tick stream through it, reporting ticks/s. Every resolved signal is replaced
+by a new one at levels around the current price (and the books compacted as
+the tracker does after a flush), so the book stays at --signals for the whole
+run. Target: >= 50k ticks/s with 100k open signals, measured over on_tick and
+compaction; adding the replacements is signal creation, reported separately.
+
+    python benchmarks/outcome_resolver.py --signals 100000 --ticks 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from outcome_resolver import OutcomeResolver
+
+ASSETS = {
+    "BTCUSDT": 42000.0, "ETHUSDT": 2800.0, "SOLUSDT": 100.0, "SPY": 480.0, "QQQ": 410.0,
+    "AAPL": 190.0, "EURUSD": 1.09, "GBPUSD": 1.27, "XAUUSD": 2030.0,
+}
+
+def add_signal(resolver: OutcomeResolver, asset: str, price: float):
+    side = random.choice(["BUY", "SELL"])
+    entry = price * random.uniform(0.98, 1.02)
+    distance = entry * random.uniform(0.005, 0.05)
+    if side == "BUY":
+        take_profit, stop_loss = entry + distance * 2, entry - distance
+    else:
+        take_profit, stop_loss = entry - distance * 2, entry + distance
+    resolver.add(str(uuid.uuid4()), asset, side, take_profit, stop_loss)
+
+def load_signals(resolver: OutcomeResolver, count: int):
+    for _ in range(count):
+        add_signal(resolver, *random.choice(list(ASSETS.items())))
+
+def generate_ticks(count: int):
+    prices = dict(ASSETS)
+    names = list(ASSETS)
+    ticks = []
+    for _ in range(count):
+        asset = random.choice(names)
+        prices[asset] *= 1 + random.gauss(0, 0.0005)
+        ticks.append((asset, prices[asset]))
+    return ticks
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk outcome resolver benchmark")
+    parser.add_argument("--signals", type=int, default=100000)
+    parser.add_argument("--ticks", type=int, default=1000000)
+    parser.add_argument("--compact-every", type=int, default=10000, help="ticks between compactions")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    resolver = OutcomeResolver()
+    started = time.perf_counter()
+    load_signals(resolver, args.signals)
+    load_seconds = time.perf_counter() - started
+
+    ticks = generate_ticks(args.ticks)
+    resolved = 0
+    open_samples = []
+    tick_seconds = 0.0
+    clock = time.perf_counter
+    started = clock()
+    for count, (asset, price) in enumerate(ticks, 1):
+        tick_started = clock()
+        outcomes = resolver.on_tick(asset, price)
+        tick_seconds += clock() - tick_started
+        if outcomes:
+            resolved += len(outcomes)
+            for _ in outcomes:
+                add_signal(resolver, asset, price)
+        if count % args.compact_every == 0:
+            tick_started = clock()
+            resolver.compact()
+            tick_seconds += clock() - tick_started
+            open_samples.append(len(resolver))
+    elapsed = clock() - started
+
+    ticks_per_s = round(args.ticks / tick_seconds)
+    print(json.dumps({
+        "open_signals": args.signals,
+        "load_s": round(load_seconds, 2),
+        "ticks": args.ticks,
+        "resolver_s": round(tick_seconds, 3),
+        "ticks_per_s": ticks_per_s,
+        "with_replacements_s": round(elapsed, 3),
+        "with_replacements_ticks_per_s": round(args.ticks / elapsed),
+        "resolved_and_replaced": resolved,
+        "open_during_run": {
+            "min": min(open_samples, default=len(resolver)),
+            "max": max(open_samples, default=len(resolver)),
+        },
+        "target_met": ticks_per_s >= 50000,
+    }, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Performance timeseries benchmark
+Seeds one user with a long synthetic history straight into MongoDB, times the
+`manage.py rebuild-daily` backfill of performance_daily, then compares
+GET /api/performance/timeseries (reads the daily buckets in the window) with
+aggregating the same window from the raw signals, as the endpoint would have
+to without the rollups. Exits non-zero if the two disagree.
+
+    python benchmarks/performance_timeseries.py --mongo-url mongodb://localhost:27017 --signals 1000000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from pymongo import MongoClient
+
+from dashboard_history import seed_signals
+from loadtest import LocalServer
+from mixed_load import percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def latency_summary(samples: list) -> dict:
+    return {
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+    }
+
+async def rebuild_daily(env: dict, chunk_days: int, workers: int) -> float:
+    """Run the real rebuild-daily command (with the fake LLM client) and return its wall time"""
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", "import sys, fake_llm; fake_llm.install(); import manage; sys.exit(manage.main())",
+        "rebuild-daily", "--chunk-days", str(chunk_days), "--workers", str(workers),
+        cwd=HERE, env={**env, "PYTHONPATH": os.path.join(HERE, "..", "backend")},
+        stdout=asyncio.subprocess.DEVNULL,
+    )
+    if await process.wait():
+        raise RuntimeError("rebuild-daily failed")
+    return time.perf_counter() - started
+
+def scan_window(collection, user_id: str, since: datetime, until: datetime) -> dict:
+    """Per-day totals aggregated from the raw signals"""
+    rows = collection.aggregate([
+        {"$match": {"user_id": user_id, "created_at": {"$gte": since, "$lt": until}}},
+        {"$group": {
+            "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+            "total": {"$sum": 1},
+            "hit_tp": {"$sum": {"$cond": [{"$eq": ["$status", "hit_tp"]}, 1, 0]}},
+            "stopped_out": {"$sum": {"$cond": [{"$eq": ["$status", "stopped_out"]}, 1, 0]}},
+            "confidence": {"$avg": "$confidence"},
+        }}
+    ])
+    return {row["_id"]: row["total"] for row in rows}
+
+async def run_benchmark(server: LocalServer, args) -> dict:
+    async with httpx.AsyncClient(base_url=server.base_url, timeout=120) as client:
+        email = f"timeseries_{uuid.uuid4().hex[:12]}@signaldesk.ai"
+        response = await client.post("/auth/register", json={"email": email, "password": "timeseriespass123", "name": "Timeseries User"})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        user_id = (await client.get("/auth/me", headers=headers)).json()["user_id"]
+
+        started = time.perf_counter()
+        await asyncio.to_thread(seed_signals, user_id, args.signals)
+        seed_seconds = time.perf_counter() - started
+        rebuild_seconds = await rebuild_daily(server.env, args.chunk_days, args.workers)
+
+        mongo = MongoClient(args.mongo_url, tz_aware=True)
+        signals = mongo[server.db_name]["signals"]
+        results = {}
+        for interval in ("day", "week"):
+            rollup_samples, points = [], []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                response = await client.get("/performance/timeseries", params={"interval": interval, "since": args.since}, headers=headers)
+                rollup_samples.append(time.perf_counter() - started)
+                response.raise_for_status()
+                points = response.json()["points"]
+            results[interval] = {"points": len(points), "rollups": latency_summary(rollup_samples)}
+
+        # The raw-signal scan covers the daily window the endpoint resolved
+        daily = (await client.get("/performance/timeseries", params={"since": args.since}, headers=headers)).json()
+        since = datetime.fromisoformat(daily["since"])
+        until = datetime.fromisoformat(daily["until"])
+        scan_samples, scanned = [], {}
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            scanned = await asyncio.to_thread(scan_window, signals, user_id, since, until)
+            scan_samples.append(time.perf_counter() - started)
+        mongo.close()
+        from_rollups = {point["start"][:10]: point["total_signals"] for point in daily["points"] if point["total_signals"]}
+    return {
+        "signals": args.signals,
+        "seed_seconds": round(seed_seconds, 1),
+        "rebuild_daily_seconds": round(rebuild_seconds, 1),
+        "timeseries": results,
+        "raw_signal_scan": latency_summary(scan_samples),
+        "matches_scan": from_rollups == scanned,
+    }
+
+async def main_async(args) -> dict:
+    async with LocalServer(args.mongo_url, False, llm_latency_ms=0) as server:
+        # seed_signals writes to the database named by these variables
+        os.environ["MONGO_URL"] = args.mongo_url
+        os.environ["DB_NAME"] = server.db_name
+        return await run_benchmark(server, args)
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk performance timeseries benchmark")
+    parser.add_argument("--mongo-url", required=True, help="local MongoDB to create a throwaway database on")
+    parser.add_argument("--signals", type=int, default=1000000, help="seeded one per minute, ending now")
+    parser.add_argument("--since", default=(datetime.now(timezone.utc) - timedelta(days=180)).date().isoformat())
+    parser.add_argument("--requests", type=int, default=50, help="timed requests per variant")
+    parser.add_argument("--chunk-days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print(json.dumps(report, indent=2))
+    return 0 if report["matches_scan"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - WebSocket push fan-out benchmark
+Opens many idle /api/ws sessions spread over a set of users, then fires
+bursts of signal status changes and measures how long each event takes to
+reach every session of its user. With a locally started server it also
+reports the server's resident memory before and after the sessions connect.
+
+    python benchmarks/push_fanout.py --mongomock --connections 10000 --users 200
+    python benchmarks/push_fanout.py --base-url http://localhost:8001/api --connections 2000
+"""
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import time
+import uuid
+
+import httpx
+import websockets
+
+from loadtest import LocalServer
+from mixed_load import percentile
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+def server_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+async def create_users(client: httpx.AsyncClient, count: int) -> list:
+    """Register users, each with one signal whose status the bursts flip"""
+    users = []
+    for _ in range(count):
+        response = await client.post("/auth/register", json={
+            "email": f"push_{uuid.uuid4().hex[:12]}@signaldesk.ai", "password": "pushpass123", "name": "Push User"
+        })
+        response.raise_for_status()
+        token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        signal = await client.post("/signals/generate", json={"asset": "BTCUSDT", "timeframe": "Swing"}, headers=headers)
+        signal.raise_for_status()
+        users.append({"token": token, "headers": headers, "signal_id": signal.json()["id"], "status": "active"})
+    return users
+
+class Listener:
+    """Collects delivery latencies for events the benchmark is waiting on"""
+
+    def __init__(self):
+        self.sent_at = {}
+        self.latencies = []
+        self.received = 0
+        self.arrived = asyncio.Event()
+
+    async def listen(self, socket):
+        try:
+            async for raw in socket:
+                message = json.loads(raw)
+                if message["event"] != "signal.status":
+                    continue
+                started = self.sent_at.get((message["data"]["signal_id"], message["data"]["status"]))
+                if started is not None:
+                    self.latencies.append(time.perf_counter() - started)
+                    self.received += 1
+                    self.arrived.set()
+        except websockets.ConnectionClosed:
+            pass
+
+async def run_benchmark(base_url: str, args, server_pid=None) -> dict:
+    ws_url = base_url.replace("http", "ws", 1) + "/ws"
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        users = await create_users(client, args.users)
+        rss_before = server_rss_mb(server_pid) if server_pid else None
+
+        listener = Listener()
+        sessions_per_user = [0] * len(users)
+        gate = asyncio.Semaphore(args.connect_concurrency)
+
+        async def open_session(index: int):
+            user = users[index % len(users)]
+            async with gate:
+                socket = await websockets.connect(
+                    ws_url, additional_headers={"Authorization": f"Bearer {user['token']}"},
+                    ping_interval=None, max_queue=None
+                )
+            sessions_per_user[index % len(users)] += 1
+            return socket
+
+        connect_started = time.perf_counter()
+        sockets = await asyncio.gather(*(open_session(i) for i in range(args.connections)))
+        connect_seconds = time.perf_counter() - connect_started
+        readers = [asyncio.create_task(listener.listen(socket)) for socket in sockets]
+        await asyncio.sleep(args.idle)
+        rss_connected = server_rss_mb(server_pid) if server_pid else None
+
+        bursts = []
+        for burst in range(args.bursts):
+            targets = [users[(burst * args.burst_size + i) % len(users)] for i in range(args.burst_size)]
+            targets = list({id(user): user for user in targets}.values())
+            expected = sum(sessions_per_user[users.index(user)] for user in targets)
+            listener.latencies, listener.received = [], 0
+            for user in targets:
+                user["status"] = "hit_tp" if user["status"] == "active" else "active"
+                listener.sent_at[(user["signal_id"], user["status"])] = time.perf_counter()
+
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                client.patch(f"/signals/{user['signal_id']}/status", params={"status": user["status"]}, headers=user["headers"])
+                for user in targets
+            ))
+            deadline = started + args.timeout
+            while listener.received < expected and time.perf_counter() < deadline:
+                listener.arrived.clear()
+                try:
+                    await asyncio.wait_for(listener.arrived.wait(), timeout=max(deadline - time.perf_counter(), 0.001))
+                except asyncio.TimeoutError:
+                    break
+            elapsed = time.perf_counter() - started
+            bursts.append({
+                "events": len(targets),
+                "expected_deliveries": expected,
+                "delivered": listener.received,
+                "elapsed_s": round(elapsed, 3),
+                "deliveries_per_s": round(listener.received / elapsed, 1) if elapsed else 0,
+                "p50_ms": round(percentile(listener.latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(listener.latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(listener.latencies, 99) * 1000, 2),
+            })
+
+        stats = (await client.get("/stats")).json().get("push", {})
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*(socket.close() for socket in sockets), return_exceptions=True)
+
+    return {
+        "connections": args.connections,
+        "users": len(users),
+        "connect_s": round(connect_seconds, 2),
+        "server_rss_mb": {"before": rss_before, "connected": rss_connected},
+        "bursts": bursts,
+        "server_push_stats": stats,
+    }
+
+async def main_async(args) -> dict:
+    if args.base_url:
+        return await run_benchmark(args.base_url, args)
+    uvicorn_args = ["--ws-per-message-deflate", "true" if args.deflate else "false"]
+    async with LocalServer(args.mongo_url, args.mongomock, llm_latency_ms=0, uvicorn_args=uvicorn_args) as server:
+        return await run_benchmark(server.base_url, args, server.process.pid)
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk WebSocket push benchmark")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--mongo-url", help="local MongoDB to create a throwaway database on")
+    target.add_argument("--mongomock", action="store_true", help="run the server on in-memory mongomock-motor")
+    target.add_argument("--base-url", help="drive an already running server instead of starting one")
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--connect-concurrency", type=int, default=200)
+    parser.add_argument("--idle", type=float, default=2.0, help="seconds to sit idle before the bursts")
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--burst-size", type=int, default=100, help="users whose signal changes per burst")
+    parser.add_argument("--deflate", action="store_true",
+                        help="keep uvicorn's per-message deflate on (costs zlib state per session)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for a burst to be delivered")
+    args = parser.parse_args()
+
+    limit = raise_fd_limit()
+    if args.connections + 256 > limit:
+        parser.error(f"open file limit {limit} is too low for {args.connections} connections")
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
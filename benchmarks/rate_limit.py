@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Rate limiter overhead benchmark
+Times LocalRateLimiter.hit (the check every generation request pays) over
+many user buckets, awaited on the event loop as the routes do. With
+--mongo-url it also times the shared MongoRateLimiter against a throwaway
+collection.
+
+    python benchmarks/rate_limit.py --users 100000 --hits 500000
+    python benchmarks/rate_limit.py --mongo-url mongodb://localhost:27017 --mongo-hits 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from rate_limit import LocalRateLimiter, MongoRateLimiter, RateLimit  # noqa: E402
+
+from mixed_load import percentile  # noqa: E402
+
+LIMIT = RateLimit.per_minute(30, 20)
+
+async def time_hits(limiter, keys, hits: int) -> dict:
+    samples = []
+    for _ in range(hits):
+        key = random.choice(keys)
+        started = time.perf_counter()
+        await limiter.hit(key, LIMIT)
+        samples.append(time.perf_counter() - started)
+    return {
+        "hits": hits,
+        "mean_us": round(sum(samples) / len(samples) * 1e6, 2),
+        "p50_us": round(percentile(samples, 50) * 1e6, 2),
+        "p99_us": round(percentile(samples, 99) * 1e6, 2),
+        "hits_per_s": round(hits / sum(samples)),
+        **{key: value for key, value in limiter.stats().items() if key in ("allowed", "rejected", "keys")},
+    }
+
+async def run(args) -> dict:
+    random.seed(args.seed)
+    keys = [f"generate:minute:{uuid.uuid4()}" for _ in range(args.users)]
+    results = {"local": await time_hits(LocalRateLimiter(args.users), keys, args.hits)}
+    if args.mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(args.mongo_url)
+        db_name = f"signaldesk_bench_{uuid.uuid4().hex[:8]}"
+        try:
+            limiter = MongoRateLimiter(client[db_name]["rate_limits"])
+            await limiter.start()
+            results["mongo"] = await time_hits(limiter, keys[:1000], args.mongo_hits)
+        finally:
+            await client.drop_database(db_name)
+            client.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk rate limiter benchmark")
+    parser.add_argument("--users", type=int, default=100000, help="distinct buckets")
+    parser.add_argument("--hits", type=int, default=500000)
+    parser.add_argument("--mongo-url", help="also time the shared MongoDB backend")
+    parser.add_argument("--mongo-hits", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
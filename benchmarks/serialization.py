@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Response serialization micro-benchmark
+Renders GET /api/signals pages of synthetic signals three ways and reports
+per-page latency, without a server or database:
+
+  jsonable_encoder  dict route without a response model (the old path)
+  response_model    FastAPI validating the dict against SignalListResponse
+  orjson            ORJSONResponse over the raw documents (the current path)
+
+    python benchmarks/serialization.py --sizes 20,100,500 --rounds 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "signaldesk_serialization_bench")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+import bench_server  # noqa: E402,F401  (puts backend/ on sys.path with the fake LLM client)
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from dashboard_history import synthetic_signal  # noqa: E402
+from mixed_load import percentile  # noqa: E402
+from server import SignalListResponse  # noqa: E402
+
+LIST_ADAPTER = TypeAdapter(SignalListResponse)
+
+def render_jsonable_encoder(page: dict) -> bytes:
+    return JSONResponse(jsonable_encoder(page)).body
+
+def render_response_model(page: dict) -> bytes:
+    # What FastAPI does for a dict returned from a route declaring response_model
+    validated = LIST_ADAPTER.validate_python(page)
+    return JSONResponse(jsonable_encoder(LIST_ADAPTER.dump_python(validated, mode="json"))).body
+
+def render_orjson(page: dict) -> bytes:
+    return ORJSONResponse(page).body
+
+RENDERERS = {
+    "jsonable_encoder": render_jsonable_encoder,
+    "response_model": render_response_model,
+    "orjson": render_orjson,
+}
+
+def build_page(size: int) -> dict:
+    user_id = str(uuid.uuid4())
+    start = datetime.now(timezone.utc)
+    signals = [synthetic_signal(user_id, start - timedelta(minutes=i)) for i in range(size)]
+    return {"signals": signals, "count": size, "next_cursor": None}
+
+def time_renderer(render, page: dict, rounds: int) -> dict:
+    for _ in range(min(rounds, 10)):
+        render(page)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        body = render(page)
+        samples.append(time.perf_counter() - started)
+    return {
+        "bytes": len(body),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk response serialization benchmark")
+    parser.add_argument("--sizes", default="20,100,500", help="signals per page")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    results = {}
+    for size in (int(value) for value in args.sizes.split(",")):
+        page = build_page(size)
+        timings = {name: time_renderer(render, page, args.rounds) for name, render in RENDERERS.items()}
+        baseline = timings["jsonable_encoder"]["p50_ms"]
+        for stats in timings.values():
+            stats["speedup_p50"] = round(baseline / stats["p50_ms"], 1) if stats["p50_ms"] else None
+        results[f"{size}_signals"] = timings
+    print(json.dumps(results, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
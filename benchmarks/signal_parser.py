@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Signal reply parser fuzz and throughput benchmark
+Runs backend/signal_parser.py over a corpus of saved model replies (JSONL
+with a "reply" field and an optional "expect" of "ok" or an error category):
+
+  corpus       every reply with an "expect" parses to that outcome
+  throughput   replies/s for the parser and the old greedy regex + json.loads
+               (which did no validation)
+  adversarial  replies of unbalanced braces, where the regex backtracks
+  fuzz         random truncations, deletions and structural-character
+               insertions; anything but a SignalParseError is a bug
+
+    python benchmarks/signal_parser.py
+    python benchmarks/signal_parser.py --corpus saved_replies.jsonl --fuzz 100000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "backend"))
+
+from signal_parser import CATEGORIES, SignalParseError, parse_signal  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(HERE, "data", "signal_replies.jsonl")
+FUZZ_CHARACTERS = '{}[]",:\\` \n'
+
+def legacy_parse(text: str) -> dict:
+    """The parser server.py used before signal_parser existed"""
+    match = re.search(r'\{[\s\S]*\}', text)
+    if match:
+        return json.loads(match.group())
+    raise ValueError("No JSON found in response")
+
+def load_corpus(path: str) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def outcome(text: str) -> str:
+    try:
+        parse_signal(text)
+        return "ok"
+    except SignalParseError as e:
+        return e.category
+
+def check_corpus(corpus: list) -> dict:
+    mismatches = [
+        {"note": entry.get("note"), "expected": entry["expect"], "got": outcome(entry["reply"])}
+        for entry in corpus if "expect" in entry and outcome(entry["reply"]) != entry["expect"]
+    ]
+    return {"replies": len(corpus), "checked": sum("expect" in entry for entry in corpus), "mismatches": mismatches}
+
+def replies_per_second(parse, replies: list, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for reply in replies:
+            try:
+                parse(reply)
+            except ValueError:
+                pass
+    return round(rounds * len(replies) / (time.perf_counter() - started))
+
+def adversarial(sizes) -> dict:
+    results = {}
+    for size in sizes:
+        reply = "Analysis: " + "{" * size + " momentum is mixed"
+        timings = {}
+        for name, parse in (("parser", parse_signal), ("legacy_regex", legacy_parse)):
+            started = time.perf_counter()
+            try:
+                parse(reply)
+            except ValueError:
+                pass
+            timings[f"{name}_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        results[f"{size}_braces"] = timings
+    return results
+
+def mutate(text: str, rng: random.Random) -> str:
+    for _ in range(rng.randint(1, 4)):
+        if not text:
+            break
+        position = rng.randrange(len(text))
+        operation = rng.randrange(4)
+        if operation == 0:
+            text = text[:position]
+        elif operation == 1:
+            text = text[:position] + text[position + rng.randint(1, 8):]
+        elif operation == 2:
+            text = text[:position] + rng.choice(FUZZ_CHARACTERS) + text[position:]
+        else:
+            end = min(len(text), position + rng.randint(1, 32))
+            text = text[:end] + text[position:end] + text[end:]
+    return text
+
+def fuzz(corpus: list, iterations: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    sources = [entry["reply"] for entry in corpus]
+    outcomes = {category: 0 for category in ("ok",) + CATEGORIES}
+    crashes = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        text = mutate(rng.choice(sources), rng)
+        try:
+            parse_signal(text)
+            outcomes["ok"] += 1
+        except SignalParseError as e:
+            outcomes[e.category] += 1
+        except Exception as e:
+            crashes.append({"error": repr(e), "reply": text[:200]})
+    return {
+        "iterations": iterations,
+        "replies_per_s": round(iterations / (time.perf_counter() - started)),
+        "outcomes": outcomes,
+        "unexpected_exceptions": len(crashes),
+        "examples": crashes[:5],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk signal parser benchmark")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSONL of saved replies")
+    parser.add_argument("--rounds", type=int, default=200, help="passes over the corpus for throughput")
+    parser.add_argument("--fuzz", type=int, default=20000, help="mutated replies to parse")
+    parser.add_argument("--adversarial-sizes", default="1000,5000,20000")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    replies = [entry["reply"] for entry in corpus]
+    report = {
+        "corpus": check_corpus(corpus),
+        "throughput_replies_per_s": {
+            "parser": replies_per_second(parse_signal, replies, args.rounds),
+            "legacy_regex_unvalidated": replies_per_second(legacy_parse, replies, args.rounds),
+        },
+        "adversarial": adversarial(int(size) for size in args.adversarial_sizes.split(",")),
+        "fuzz": fuzz(corpus, args.fuzz, args.seed),
+    }
+    print(json.dumps(report, indent=2))
+    failed = report["corpus"]["mismatches"] or report["fuzz"]["unexpected_exceptions"]
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
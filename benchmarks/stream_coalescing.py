@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+SignalDesk AI - Streamed generation coalescing check
+Starts the API locally with the fake streaming LLM client, opens --streams
+concurrent POST /api/signals/generate/stream requests for one asset and
+timeframe, and checks from /api/stats that they shared one model call and
+that every stream received the same chunk text. Exits non-zero otherwise.
+
+    python benchmarks/stream_coalescing.py --mongomock --streams 50
+    python benchmarks/stream_coalescing.py --mongo-url mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+
+import httpx
+
+from loadtest import LocalServer
+
+async def read_stream(client, headers, body: dict) -> dict:
+    text, events = [], []
+    started = time.perf_counter()
+    async with client.stream("POST", "/signals/generate/stream", json=body, headers=headers) as response:
+        response.raise_for_status()
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+                events.append(event)
+            elif line.startswith("data: ") and event == "chunk":
+                text.append(json.loads(line[len("data: "):])["text"])
+    return {"text": "".join(text), "events": events, "seconds": time.perf_counter() - started}
+
+async def run(base_url: str, args) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        response = await client.post("/auth/register", json={
+            "email": f"stream_{uuid.uuid4().hex[:12]}@signaldesk.ai", "password": "streampass123", "name": "Stream User"
+        })
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        body = {"asset": args.asset, "timeframe": args.timeframe}
+
+        before = (await client.get("/stats")).json()["signal_analysis"]
+        streams = await asyncio.gather(*(read_stream(client, headers, body) for _ in range(args.streams)))
+        after = (await client.get("/stats")).json()["signal_analysis"]
+
+    texts = {stream["text"] for stream in streams}
+    return {
+        "streams": args.streams,
+        "model_calls": after["model_calls"] - before["model_calls"],
+        "coalesced": after["coalesced"] - before["coalesced"],
+        "streams_with_chunks": sum(bool(stream["text"]) for stream in streams),
+        "distinct_chunk_texts": len(texts),
+        "completed": sum(stream["events"][-1:] == ["signal"] for stream in streams),
+        "max_seconds": round(max(stream["seconds"] for stream in streams), 3),
+    }
+
+async def main_async(args) -> dict:
+    async with LocalServer(args.mongo_url, args.mongomock, llm_latency_ms=args.llm_latency_ms) as server:
+        return await run(server.base_url, args)
+
+def main():
+    parser = argparse.ArgumentParser(description="SignalDesk streamed generation coalescing check")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--mongo-url", help="local MongoDB to create a throwaway database on")
+    target.add_argument("--mongomock", action="store_true", help="use in-memory mongomock instead")
+    parser.add_argument("--streams", type=int, default=50)
+    parser.add_argument("--asset", default="BTCUSDT")
+    parser.add_argument("--timeframe", default="Swing")
+    parser.add_argument("--llm-latency-ms", type=int, default=500, help="fake model latency; streams join during it")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print(json.dumps(report, indent=2))
+    ok = report["model_calls"] == 1 and report["completed"] == args.streams and report["distinct_chunk_texts"] == 1
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,7 +14,7 @@ import { LinearGradient } from 'expo-linear-gradient';
 import { Ionicons } from '@expo/vector-icons';
 import { useAuth } from '../context/AuthContext';
 import { useSubscription } from '../context/SubscriptionContext';
-import { dashboardAPI } from '../services/api';
+import { dashboardAPI, pushAPI } from '../services/api';
 import { colors, spacing, borderRadius, typography } from '../utils/theme';
 
 const { width } = Dimensions.get('window');
@@ -49,6 +49,13 @@ const DashboardScreen = ({ navigation }) => {
     fetchDashboard();
   }, [fetchDashboard]);
 
+  // Refresh only when something actually changed instead of polling
+  useEffect(() => pushAPI.subscribe((message) => {
+    if (message.event === 'signal.created' || message.event === 'signal.status') {
+      fetchDashboard();
+    }
+  }, fetchDashboard), [fetchDashboard]);
+
   const onRefresh = async () => {
     setRefreshing(true);
     await fetchDashboard();
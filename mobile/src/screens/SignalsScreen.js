@@ -15,7 +15,7 @@ import { LinearGradient } from 'expo-linear-gradient';
 import { Ionicons } from '@expo/vector-icons';
 import * as Haptics from 'expo-haptics';
 import { useSubscription } from '../context/SubscriptionContext';
-import { signalsAPI, assetsAPI } from '../services/api';
+import { signalsAPI, assetsAPI, pushAPI } from '../services/api';
 import { colors, spacing, borderRadius, typography } from '../utils/theme';
 
 const TIMEFRAMES = ['Scalp', 'Intraday', 'Swing'];
@@ -59,6 +59,17 @@ const SignalsScreen = ({ navigation }) => {
     Promise.all([fetchSignals(), fetchAssets()]).finally(() => setLoading(false));
   }, [fetchSignals, fetchAssets]);
 
+  useEffect(() => pushAPI.subscribe((message) => {
+    const { event, data } = message;
+    if (event === 'signal.created') {
+      setSignals(prev => (prev.some(s => (s.signal_id || s.id) === data.id) ? prev : [data, ...prev]));
+    } else if (event === 'signal.status') {
+      setSignals(prev => prev.map(s => (
+        (s.signal_id || s.id) === data.signal_id ? { ...s, status: data.status } : s
+      )));
+    }
+  }, fetchSignals), [fetchSignals]);
+
   const onRefresh = async () => {
     setRefreshing(true);
     await fetchSignals();
@@ -81,7 +92,7 @@ const SignalsScreen = ({ navigation }) => {
       });
       
       Haptics.notificationAsync(Haptics.NotificationFeedbackType.Success);
-      setSignals(prev => [response.data, ...prev]);
+      setSignals(prev => [response.data, ...prev.filter(s => (s.signal_id || s.id) !== response.data.id)]);
       
       // Navigate to detail
       navigation.navigate('SignalDetail', { signal: response.data });
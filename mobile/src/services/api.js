@@ -11,8 +11,13 @@ const api = axios.create({
   headers: {
     'Content-Type': 'application/json',
   },
+  // 304 means our cached copy is still current (see ETag handling below)
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
 });
 
+// Last ETag + body per GET URL, replayed when the server answers 304
+const etagCache = new Map();
+
 // Request interceptor to add auth token
 api.interceptors.request.use(
   async (config) => {
@@ -20,6 +25,10 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    const cached = config.method === 'get' && etagCache.get(api.getUri(config));
+    if (cached) {
+      config.headers['If-None-Match'] = cached.etag;
+    }
     return config;
   },
   (error) => Promise.reject(error)
@@ -27,9 +36,20 @@ api.interceptors.request.use(
 
 // Response interceptor for error handling
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    if (response.config.method !== 'get') return response;
+    const url = api.getUri(response.config);
+    if (response.status === 304 && etagCache.has(url)) {
+      return { ...response, status: 200, data: etagCache.get(url).data };
+    }
+    if (response.headers.etag) {
+      etagCache.set(url, { etag: response.headers.etag, data: response.data });
+    }
+    return response;
+  },
   (error) => {
     if (error.response?.status === 401) {
+      etagCache.clear();
       // Handle unauthorized - clear token and redirect to login
       SecureStore.deleteItemAsync('authToken');
     }
@@ -37,6 +57,24 @@ api.interceptors.response.use(
   }
 );
 
+// POST that is safe to retry: every attempt carries the same Idempotency-Key,
+// so a retry after a dropped response replays the original result server-side.
+const newIdempotencyKey = () =>
+  `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+
+const postIdempotent = async (url, data, attempts = 3) => {
+  const headers = { 'Idempotency-Key': newIdempotencyKey() };
+  for (let attempt = 1; ; attempt += 1) {
+    try {
+      return await api.post(url, data, { headers });
+    } catch (error) {
+      // Retry only when no response arrived (timeout, network drop)
+      if (error.response || attempt >= attempts) throw error;
+      await new Promise((resolve) => setTimeout(resolve, 500 * attempt));
+    }
+  }
+};
+
 // Auth endpoints
 export const authAPI = {
   register: (data) => api.post('/auth/register', data),
@@ -46,7 +84,7 @@ export const authAPI = {
 
 // Signal endpoints
 export const signalsAPI = {
-  generate: (data) => api.post('/signals/generate', data),
+  generate: (data) => postIdempotent('/signals/generate', data),
   getAll: (limit = 20) => api.get(`/signals?limit=${limit}`),
   getOne: (id) => api.get(`/signals/${id}`),
   updateStatus: (id, status) => api.patch(`/signals/${id}/status?status=${status}`),
@@ -55,12 +93,13 @@ export const signalsAPI = {
 // Performance endpoints
 export const performanceAPI = {
   get: () => api.get('/performance'),
+  timeseries: (params = {}) => api.get('/performance/timeseries', { params }),
 };
 
 // Subscription endpoints
 export const subscriptionAPI = {
   get: () => api.get('/subscription'),
-  activate: (data) => api.post('/subscription/activate', data),
+  activate: (data) => postIdempotent('/subscription/activate', data),
   cancel: () => api.post('/subscription/cancel'),
 };
 
@@ -74,6 +113,38 @@ export const assetsAPI = {
   get: () => api.get('/assets'),
 };
 
+// Real-time push: signal.created, signal.status and subscription.updated events.
+// Returns an unsubscribe function; reconnects after drops (the server closes
+// sessions that fall behind, so callers should refetch on reconnect).
+export const pushAPI = {
+  subscribe: (onEvent, onReconnect) => {
+    let socket = null;
+    let stopped = false;
+    let retryTimer = null;
+
+    const connect = async (isRetry) => {
+      const token = await SecureStore.getItemAsync('authToken');
+      if (stopped || !token) return;
+      // Token goes in a handshake header: URLs (and their query strings) end up in access logs
+      socket = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}/ws`, null, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+      socket.onopen = () => isRetry && onReconnect && onReconnect();
+      socket.onmessage = (message) => onEvent(JSON.parse(message.data));
+      socket.onclose = () => {
+        if (!stopped) retryTimer = setTimeout(() => connect(true), 3000);
+      };
+    };
+
+    connect(false);
+    return () => {
+      stopped = true;
+      clearTimeout(retryTimer);
+      if (socket) socket.close();
+    };
+  },
+};
+
 // Health check
 export const healthAPI = {
   check: () => api.get('/health'),